@@ -1,13 +1,39 @@
 # Copyright 2025 Entalpic
+import gzip
 import logging
+import re
+import subprocess
+import tempfile
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 import mysql.connector
 from mysql.connector import Error
 
 logger = logging.getLogger(__name__)
 
+# Session settings for replaying a SQL dump: rows are not checked one by one
+# against the unique and foreign keys, which the dump already satisfies
+_DISABLE_KEY_CHECKS = b"SET unique_checks=0;\nSET foreign_key_checks=0;\n"
+# The INSERTs are not committed one statement at a time either. This is not a
+# single transaction: the DDL and LOCK/UNLOCK TABLES statements of the dump
+# commit implicitly, so the data is committed once per table.
+_BULK_LOAD_SESSION = b"SET autocommit=0;\n" + _DISABLE_KEY_CHECKS
+# A whole INSERT statement on a single line, as written by mysqldump
+_INSERT_LINE_RE = re.compile(rb"(INSERT INTO `?[^`\s]+`? VALUES )(\(.*\));\s*$")
+# Size of the coalesced INSERT statements, below the default max_allowed_packet
+# of the server (4 MB for MySQL 5.7)
+DEFAULT_MAX_STATEMENT_BYTES = 4 * 1024 * 1024
+# First line of a table definition and its secondary key and foreign key lines,
+# as written by mysqldump
+_CREATE_TABLE_RE = re.compile(rb"CREATE TABLE (?:IF NOT EXISTS )?(`?[^`\s]+`?) \(")
+_SECONDARY_KEY_RE = re.compile(rb"\s*(?:(?:UNIQUE|FULLTEXT|SPATIAL) )?KEY ")
+# Name of an AUTO_INCREMENT column, and first column of a key definition
+_AUTO_INCREMENT_COLUMN_RE = re.compile(rb"\s*(`[^`]+`) [^,]*\bAUTO_INCREMENT\b")
+_KEY_FIRST_COLUMN_RE = re.compile(rb"[^(]*\((`[^`]+`)")
+_PRIMARY_KEY_RE = re.compile(rb"\s*PRIMARY KEY ")
+_CONSTRAINT_RE = re.compile(rb"\s*CONSTRAINT ")
+
 
 class MySQLDatabase:
     """A minimal MySQL database handler for dumping and fetching data."""
@@ -46,6 +72,8 @@ class MySQLDatabase:
         self.table_name = table_name
         self.connection = None
         self.cert_path = cert_path
+        # Whether ``USE database`` was already run on the current connection
+        self._database_selected = False
 
     def connect(self) -> None:
         """Establish connection to the database."""
@@ -73,10 +101,24 @@ class MySQLDatabase:
                 ssl_cert=ssl_cert,
                 ssl_key=ssl_key,
             )
+            self._database_selected = False
         except Error as e:
             logger.error(f"Error connecting to MySQL server: {e}")
             raise
 
+    def _select_database(self, cursor) -> None:
+        """
+        Select the database on the current connection, once per connection.
+
+        Parameters
+        ----------
+        cursor : mysql.connector.cursor.MySQLCursor
+            The cursor to run the ``USE`` statement with
+        """
+        if not self._database_selected:
+            cursor.execute(f"USE {self.database}")
+            self._database_selected = True
+
     def create_database(self) -> None:
         """Create the database if it doesn't exist."""
         if not self.connection:
@@ -86,6 +128,7 @@ class MySQLDatabase:
             cursor = self.connection.cursor()
             cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
             cursor.execute(f"USE {self.database}")
+            self._database_selected = True
             self.connection.commit()
             logger.info(f"Database '{self.database}' created or already exists")
         except Error as e:
@@ -110,7 +153,7 @@ class MySQLDatabase:
 
         try:
             cursor = self.connection.cursor()
-            cursor.execute(f"USE {self.database}")
+            self._select_database(cursor)
             if params:
                 cursor.execute(query, params)
             else:
@@ -143,7 +186,7 @@ class MySQLDatabase:
 
         try:
             cursor = self.connection.cursor()
-            cursor.execute(f"USE {self.database}")
+            self._select_database(cursor)
             if params:
                 cursor.execute(query, params)
             else:
@@ -187,7 +230,7 @@ class MySQLDatabase:
 
         try:
             cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(f"USE {self.database}")
+            self._select_database(cursor)
 
             if query:
                 # Custom query takes precedence
@@ -225,6 +268,106 @@ class MySQLDatabase:
         finally:
             cursor.close()
 
+    def get_id_at_offset(
+        self, offset: int, table_name: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        Get the ID of the row at the specified offset, in ID order.
+
+        Parameters
+        ----------
+        offset : int
+            The offset position to get the ID from
+        table_name : Optional[str]
+            The name of the table (overrides self.table_name if provided)
+
+        Returns
+        -------
+        Optional[Any]
+            The ID at the specified offset, or None if no row exists at that offset
+        """
+        effective_table = table_name or self.table_name
+        row = self.fetch_one(
+            f"SELECT id FROM {effective_table} ORDER BY id LIMIT 1 OFFSET %s",
+            (offset,),
+        )
+        return row[0] if row else None
+
+    def fetch_items_after_id(
+        self,
+        last_id: Optional[Any],
+        batch_size: int,
+        table_name: Optional[str] = None,
+        columns: str = "*",
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch the next rows of a table in ID order, starting after ``last_id``.
+
+        Contrary to LIMIT/OFFSET pagination, the cost of a page does not grow
+        with its position in the table since the primary key index is used to
+        seek to ``last_id``.
+
+        Parameters
+        ----------
+        last_id : Optional[Any]
+            The ID of the last row of the previous page, or None for the first page
+        batch_size : int
+            The number of rows to fetch
+        table_name : Optional[str]
+            The name of the table (overrides self.table_name if provided)
+        columns : str
+            The columns to select, all of them by default
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The fetched rows, empty when there are no more rows
+        """
+        effective_table = table_name or self.table_name
+        if last_id is None:
+            query = f"SELECT {columns} FROM {effective_table} ORDER BY id LIMIT %s"
+            params = (batch_size,)
+        else:
+            query = (
+                f"SELECT {columns} FROM {effective_table} "
+                "WHERE id > %s ORDER BY id LIMIT %s"
+            )
+            params = (last_id, batch_size)
+        return self.fetch_items(query=query, params=params)
+
+    def fetch_items_between_ids(
+        self,
+        first_id: Any,
+        last_id: Any,
+        table_name: Optional[str] = None,
+        columns: str = "*",
+    ) -> list[dict[str, Any]]:
+        """
+        Fetch the rows of a table whose ID is between two IDs (both included).
+
+        Parameters
+        ----------
+        first_id : Any
+            The lowest ID to fetch
+        last_id : Any
+            The highest ID to fetch
+        table_name : Optional[str]
+            The name of the table (overrides self.table_name if provided)
+        columns : str
+            The columns to select, all of them by default
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The fetched rows, in ID order
+        """
+        effective_table = table_name or self.table_name
+        query = (
+            f"SELECT {columns} FROM {effective_table} "
+            "WHERE id BETWEEN %s AND %s ORDER BY id"
+        )
+        return self.fetch_items(query=query, params=(first_id, last_id))
+
     def drop_database(self) -> None:
         """Delete the entire database."""
         if not self.connection:
@@ -233,6 +376,7 @@ class MySQLDatabase:
         try:
             cursor = self.connection.cursor()
             cursor.execute(f"DROP DATABASE IF EXISTS {self.database}")
+            self._database_selected = False
             self.connection.commit()
             logger.info(f"Database '{self.database}' dropped successfully")
         except Error as e:
@@ -246,6 +390,165 @@ class MySQLDatabase:
         if self.connection:
             self.connection.close()
             self.connection = None
+            self._database_selected = False
+
+
+def coalesce_inserts(
+    lines: Iterable[bytes], max_statement_bytes: int = DEFAULT_MAX_STATEMENT_BYTES
+) -> Iterator[bytes]:
+    """
+    Merge consecutive INSERT statements of a SQL dump into multi-row INSERTs.
+
+    Each INSERT is executed as its own statement by the server, so a dump with
+    one row per INSERT is much slower to replay than one with multi-row
+    INSERTs. Only INSERT statements written on a single line (as mysqldump
+    does) are merged, all the other lines are kept as they are.
+
+    Parameters
+    ----------
+    lines : Iterable[bytes]
+        The lines of the SQL dump
+    max_statement_bytes : int
+        The size above which a merged statement is not extended anymore. It
+        should stay below the ``max_allowed_packet`` of the server.
+
+    Yields
+    ------
+    bytes
+        The lines of the SQL dump, with consecutive INSERTs into the same table
+        merged
+    """
+    prefix, values, size = None, [], 0
+    for line in lines:
+        match = _INSERT_LINE_RE.match(line)
+        if match is not None:
+            line_prefix, line_values = match.groups()
+            if values and (
+                line_prefix != prefix or size + len(line_values) > max_statement_bytes
+            ):
+                yield prefix + b",".join(values) + b";\n"
+                values = []
+            if not values:
+                prefix, size = line_prefix, len(line_prefix) + 2
+            values.append(line_values)
+            size += len(line_values) + 1
+            continue
+
+        if values:
+            yield prefix + b",".join(values) + b";\n"
+            values = []
+        yield line
+
+    if values:
+        yield prefix + b",".join(values) + b";\n"
+
+
+def _first_key_column(definition: bytes) -> Optional[bytes]:
+    """
+    Get the first column of a key definition of a SQL dump.
+
+    Parameters
+    ----------
+    definition : bytes
+        The key definition, e.g. ``UNIQUE KEY `name` (`column`)``
+
+    Returns
+    -------
+    Optional[bytes]
+        The quoted name of the first column of the key, None if not found
+    """
+    match = _KEY_FIRST_COLUMN_RE.match(definition)
+    return match.group(1) if match is not None else None
+
+
+def defer_secondary_keys(
+    lines: Iterable[bytes], deferred_statements: list[bytes]
+) -> Iterator[bytes]:
+    """
+    Remove the secondary keys from the table definitions of a SQL dump.
+
+    Filling a table with its secondary keys already defined updates each of
+    their indexes row by row, building them once all the rows are inserted is
+    much faster. The tables are created with their columns and primary key
+    only, and the ``ALTER TABLE`` statements adding back their keys, then their
+    foreign keys, are appended to ``deferred_statements`` once all the lines
+    are consumed.
+
+    An AUTO_INCREMENT column must lead an index, so a secondary key that is the
+    only index starting with such a column is kept in the table definition.
+
+    Parameters
+    ----------
+    lines : Iterable[bytes]
+        The lines of the SQL dump
+    deferred_statements : list[bytes]
+        The list to append the ``ALTER TABLE`` statements to, to be run after
+        the data is loaded
+
+    Yields
+    ------
+    bytes
+        The lines of the SQL dump, without the secondary keys of the tables
+    """
+    table, block, definitions = None, [], []
+    keys, constraints = [], []
+    for line in lines:
+        if table is None:
+            match = _CREATE_TABLE_RE.match(line)
+            if match is None:
+                yield line
+            else:
+                table, block, definitions = match.group(1), [line], []
+                table_keys, table_constraints = [], []
+                unindexed_columns = set()
+            continue
+
+        block.append(line)
+        if not line.startswith(b")"):
+            definition = line.rstrip().rstrip(b",")
+            if _SECONDARY_KEY_RE.match(definition):
+                table_keys.append(definition)
+                continue
+            if _CONSTRAINT_RE.match(definition):
+                table_constraints.append(b"ADD " + definition.strip())
+                continue
+
+            definitions.append(definition)
+            if match := _AUTO_INCREMENT_COLUMN_RE.match(definition):
+                unindexed_columns.add(match.group(1))
+            elif _PRIMARY_KEY_RE.match(definition):
+                unindexed_columns.discard(_first_key_column(definition))
+            continue
+
+        # End of the table definition, without a key on an AUTO_INCREMENT
+        # column the table cannot be created
+        deferred_keys = []
+        for definition in table_keys:
+            column = _first_key_column(definition)
+            if column in unindexed_columns:
+                unindexed_columns.discard(column)
+                definitions.append(definition)
+            else:
+                deferred_keys.append(b"ADD " + definition.strip())
+        table_keys = deferred_keys
+
+        yield block[0]
+        yield b",\n".join(definitions) + b"\n"
+        yield line
+        if table_keys:
+            keys.append(b"ALTER TABLE %s %s;\n" % (table, b", ".join(table_keys)))
+        if table_constraints:
+            constraints.append(
+                b"ALTER TABLE %s %s;\n" % (table, b", ".join(table_constraints))
+            )
+        table = None
+
+    if table is not None:
+        # Unterminated table definition, kept as it is
+        yield from block
+    # Foreign keys last, the keys they reference must all exist
+    deferred_statements.extend(keys)
+    deferred_statements.extend(constraints)
 
 
 def execute_sql_file(
@@ -255,29 +558,88 @@ def execute_sql_file(
     database: str = "database_name",
     host: str = "localhost",
     port: int = 3306,
+    max_statement_bytes: int = DEFAULT_MAX_STATEMENT_BYTES,
 ) -> None:
     """
     Launch a subprocess to execute a SQL file.
 
+    The file is streamed to the ``mysql`` client with autocommit off and unique
+    and foreign key checks disabled, so that a large dump is not committed and
+    checked one statement at a time. The dump is not loaded in a single
+    transaction, its DDL and LOCK/UNLOCK TABLES statements commit implicitly.
+    Consecutive single-line INSERTs are merged into multi-row INSERTs on the
+    way, and the secondary keys of the tables are only built once their rows
+    are loaded.
+
     Parameters
     ----------
     sql_file_path : str
-        The path to the SQL file to execute
+        The path to the SQL file to execute. Files ending with ``.gz`` are
+        decompressed on the fly.
+    user : str
+        The database user
+    password : str
+        The database password
+    database : str
+        The database to execute the file in
+    host : str
+        The database host
+    port : int
+        The database port
+    max_statement_bytes : int
+        The size above which merged INSERT statements are not extended anymore
+
+    Raises
+    ------
+    RuntimeError
+        If the ``mysql`` client fails to execute the file
     """
-    import subprocess
-
-    with open(sql_file_path, "r") as f:
+    opener = gzip.open if sql_file_path.endswith(".gz") else open
+    with opener(sql_file_path, "rb") as f, tempfile.TemporaryFile() as stderr:
+        # stderr goes to a file, a pipe could fill up and block the client
+        # while the dump is still being written to its stdin
         process = subprocess.Popen(
-            ["mysql", "-u", user, "-p" + password, database],
-            stdin=f,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            [
+                "mysql",
+                "-h",
+                host,
+                "-P",
+                str(port),
+                "-u",
+                user,
+                "-p" + password,
+                database,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
         )
-
-        stdout, stderr = process.communicate()
-
-    if process.returncode == 0:
-        print("SQL file executed successfully.")
-    else:
-        print("Error executing SQL file:", stderr)
+        deferred_statements = []
+        try:
+            process.stdin.write(_BULK_LOAD_SESSION)
+            process.stdin.writelines(
+                coalesce_inserts(
+                    defer_secondary_keys(f, deferred_statements), max_statement_bytes
+                )
+            )
+            # ALTER TABLE commits implicitly, the data is committed first. The
+            # end of a mysqldump dump restores the key checks, they are disabled
+            # again so that adding the foreign keys does not check every row
+            process.stdin.write(b"COMMIT;\n" + _DISABLE_KEY_CHECKS)
+            process.stdin.writelines(deferred_statements)
+        except BrokenPipeError:
+            # The client exited early, its error is reported below
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        process.wait()
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            error = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"Error executing SQL file {sql_file_path}: {error}")
+
+    logger.info(f"SQL file {sql_file_path} executed successfully")
@@ -2,15 +2,23 @@
 import itertools
 import json
 import time
+from functools import cached_property
 from typing import Any, Generator, List, Optional
 
+import numpy as np
 import psycopg2
+from psycopg2.extensions import AsIs, adapt, register_adapter
 from psycopg2.extras import Json, execute_values
 
 from lematerial_fetcher.models.models import RawStructure
 from lematerial_fetcher.models.optimade import OptimadeStructure
 from lematerial_fetcher.models.trajectories import Trajectory
 
+# Let NumPy values reach the database as they are, without converting the
+# structure fields to Python lists beforehand
+register_adapter(np.ndarray, lambda array: adapt(array.tolist()))
+register_adapter(np.integer, lambda value: AsIs(int(value)))
+
 
 class Database:
     """
@@ -85,6 +93,12 @@ class Database:
             cur.execute(f"SELECT COUNT(*) FROM {self.table_name}")
             return cur.fetchone()[0]
 
+    def rollback(self) -> None:
+        """
+        End the current transaction of the connection without committing it.
+        """
+        self.conn.rollback()
+
     def close(self) -> None:
         """
         Close the database connection.
@@ -177,6 +191,25 @@ class StructuresDatabase(Database):
             except (json.JSONDecodeError, psycopg2.Error) as e:
                 raise Exception(f"Error inserting data for ID {structure.id}: {str(e)}")
 
+    @cached_property
+    def _upsert_query(self) -> str:
+        """
+        Multi-row upsert statement used by ``batch_insert_data``.
+
+        All columns except id are updated on conflict with the new values. The
+        statement only depends on the table, so it is built once and reused by
+        every batch insert of this database object.
+        """
+        columns = ", ".join(self.columns.keys())
+        # Create SET clause for all columns except id
+        set_clause = ", ".join(
+            f"{col} = EXCLUDED.{col}" for col in self.columns.keys() if col != "id"
+        )
+        return f"""
+        INSERT INTO {self.table_name} ({columns})
+        VALUES %s
+        ON CONFLICT (id) DO UPDATE SET {set_clause};"""
+
     def batch_insert_data(
         self, structures: List[RawStructure], batch_size: int = 1000
     ) -> None:
@@ -188,7 +221,8 @@ class StructuresDatabase(Database):
         structures : List[RawStructure]
             List of structure objects to insert
         batch_size : int, optional
-            Number of structures to insert in each batch, by default 1000
+            Number of structures to insert in each batch, by default 1000. Each batch
+            is sent as a single INSERT statement and committed separately.
 
         Raises
         ------
@@ -215,22 +249,17 @@ class StructuresDatabase(Database):
                         )
                     )
 
-                columns = ", ".join(self.columns.keys())
-                # Create SET clause for all columns except id
-                set_clause = ", ".join(
-                    f"{col} = EXCLUDED.{col}"
-                    for col in self.columns.keys()
-                    if col != "id"
-                )
-                query = f"""
-                INSERT INTO {self.table_name} ({columns})
-                VALUES %s
-                ON CONFLICT (id) DO UPDATE SET {set_clause};"""
-
                 try:
-                    execute_values(cur, query, values)
+                    execute_values(
+                        cur,
+                        self._upsert_query,
+                        values,
+                        page_size=batch_size,
+                    )
                     self.conn.commit()
                 except (json.JSONDecodeError, psycopg2.Error) as e:
+                    # Leave the connection usable for the next batch
+                    self.conn.rollback()
                     raise Exception(f"Error during batch insert: {str(e)}")
 
     def fetch_items_iter(
@@ -589,7 +618,8 @@ class OptimadeDatabase(StructuresDatabase):
         structures : List[OptimadeStructure]
             List of OptimadeStructure objects to insert
         batch_size : int, optional
-            Number of structures to insert in each batch, by default 1000
+            Number of structures to insert in each batch, by default 1000. Each batch
+            is sent as a single INSERT statement and committed separately.
 
         Raises
         ------
@@ -642,23 +672,17 @@ class OptimadeDatabase(StructuresDatabase):
                         )
                     )
 
-                columns = ", ".join(self.columns.keys())
-                # Create SET clause for all columns except id
-                set_clause = ", ".join(
-                    f"{col} = EXCLUDED.{col}"
-                    for col in self.columns.keys()
-                    if col != "id"
-                )
-                # Update all columns except id on conflict with the new values
-                query = f"""
-                INSERT INTO {self.table_name} ({columns})
-                VALUES %s
-                ON CONFLICT (id) DO UPDATE SET {set_clause};"""
-
                 try:
-                    execute_values(cur, query, values)
+                    execute_values(
+                        cur,
+                        self._upsert_query,
+                        values,
+                        page_size=batch_size,
+                    )
                     self.conn.commit()
                 except (json.JSONDecodeError, psycopg2.Error) as e:
+                    # Leave the connection usable for the next batch
+                    self.conn.rollback()
                     raise Exception(f"Error during batch insert: {str(e)}")
 
 
@@ -760,7 +784,8 @@ class TrajectoriesDatabase(OptimadeDatabase):
         structures : List[Trajectory]
             List of Trajectory objects to insert
         batch_size : int, optional
-            Number of structures to insert in each batch, by default 1000
+            Number of structures to insert in each batch, by default 1000. Each batch
+            is sent as a single INSERT statement and committed separately.
 
         Raises
         ------
@@ -816,23 +841,17 @@ class TrajectoriesDatabase(OptimadeDatabase):
                         )
                     )
 
-                columns = ", ".join(self.columns.keys())
-                # Create SET clause for all columns except id
-                set_clause = ", ".join(
-                    f"{col} = EXCLUDED.{col}"
-                    for col in self.columns.keys()
-                    if col != "id"
-                )
-                # Update all columns except id on conflict with the new values
-                query = f"""
-                INSERT INTO {self.table_name} ({columns})
-                VALUES %s
-                ON CONFLICT (id) DO UPDATE SET {set_clause};"""
-
                 try:
-                    execute_values(cur, query, values)
+                    execute_values(
+                        cur,
+                        self._upsert_query,
+                        values,
+                        page_size=batch_size,
+                    )
                     self.conn.commit()
                 except (json.JSONDecodeError, psycopg2.Error) as e:
+                    # Leave the connection usable for the next batch
+                    self.conn.rollback()
                     raise Exception(f"Error during batch insert: {str(e)}")
 
 
@@ -255,11 +255,14 @@ class BaseFetcher(ABC):
 
         if self.debug:
             # Debug mode - process sequentially in main process
-            self.manager_dict = {"occurred": False, "latest_modified": None}
+            self.manager_dict = {"occurred": False}
+            self._init_worker(self.config)
             for i in range(items_info.start_offset, len(items_info.items)):
                 try:
-                    has_more_data = self._process_batch(
-                        items_info.items[i], self.config, self.manager_dict
+                    has_more_data = self._collect_batch_result(
+                        self._process_batch(
+                            items_info.items[i], self.config, self.manager_dict
+                        )
                     )
                     if not has_more_data:
                         logger.warning(f"Failed to process item at index {i}")
@@ -276,9 +279,12 @@ class BaseFetcher(ABC):
                 self.manager = Manager()
                 self.manager_dict = self.manager.dict()
                 self.manager_dict["occurred"] = False
-                self.manager_dict["latest_modified"] = None
 
-            with ProcessPoolExecutor(max_workers=self.config.num_workers) as executor:
+            with ProcessPoolExecutor(
+                max_workers=self.config.num_workers,
+                initializer=self.__class__._init_worker,
+                initargs=(self.config,),
+            ) as executor:
                 futures = set()
                 current_index = items_info.start_offset
                 more_data = True
@@ -312,7 +318,9 @@ class BaseFetcher(ABC):
                     for key, future in futures:
                         if future.done():
                             try:
-                                has_more_data = future.result()
+                                has_more_data = self._collect_batch_result(
+                                    future.result()
+                                )
                                 if not has_more_data:
                                     logger.warning(
                                         f"Failed to process batch {key}. This might be because there is no more data to process at the given URL."
@@ -372,7 +380,7 @@ class BaseFetcher(ABC):
                 # Wait for remaining futures
                 for index, future in futures:
                     try:
-                        result = future.result()
+                        result = self._collect_batch_result(future.result())
                         if not result:
                             logger.warning(f"Failed to process batch at index {index}")
                     except Exception as e:
@@ -397,7 +405,8 @@ class BaseFetcher(ABC):
             # Debug mode - process sequentially in main process
             current_index = items_info.start_offset
             more_data = True
-            self.manager_dict = {"occurred": False, "latest_modified": None}
+            self.manager_dict = {"occurred": False}
+            self._init_worker(self.config)
 
             while more_data:
                 if (
@@ -410,8 +419,8 @@ class BaseFetcher(ABC):
                     batch_info = BatchInfo(
                         offset=current_index, limit=self.config.page_limit
                     )
-                    has_more_data = self._process_batch(
-                        batch_info, self.config, self.manager_dict
+                    has_more_data = self._collect_batch_result(
+                        self._process_batch(batch_info, self.config, self.manager_dict)
                     )
                     if not has_more_data:
                         logger.warning(
@@ -436,7 +445,11 @@ class BaseFetcher(ABC):
                 self.manager_dict = self.manager.dict()
                 self.manager_dict["occurred"] = False
 
-            with ProcessPoolExecutor(max_workers=self.config.num_workers) as executor:
+            with ProcessPoolExecutor(
+                max_workers=self.config.num_workers,
+                initializer=self.__class__._init_worker,
+                initargs=(self.config,),
+            ) as executor:
                 futures = set()
                 current_index = items_info.start_offset
                 more_data = True
@@ -476,7 +489,9 @@ class BaseFetcher(ABC):
                     for index, future in futures:
                         if future.done():
                             try:
-                                has_more_data = future.result()
+                                has_more_data = self._collect_batch_result(
+                                    future.result()
+                                )
                                 if not has_more_data:
                                     logger.warning(
                                         f"Failed to process batch at offset {index}"
@@ -548,7 +563,7 @@ class BaseFetcher(ABC):
                 # Wait for remaining futures
                 for index, future in futures:
                     try:
-                        result = future.result()
+                        result = self._collect_batch_result(future.result())
                         if not result:
                             logger.warning(f"Failed to process batch at index {index}")
                     except Exception as e:
@@ -556,6 +571,44 @@ class BaseFetcher(ABC):
                             f"Error processing batch at index {index}: {str(e)}"
                         )
 
+    @staticmethod
+    def _init_worker(config: FetcherConfig) -> None:
+        """
+        Initialize per-process resources once, before any batch is processed.
+
+        This is passed as the ``initializer`` of the process pool, and called in
+        the main process in debug mode. Subclasses can override it to open
+        connections (database, HTTP session, ...) that are then reused by every
+        call to ``_process_batch`` running in the same process.
+
+        Parameters
+        ----------
+        config : FetcherConfig
+            Configuration object
+        """
+        pass
+
+    def _collect_batch_result(self, result: Any) -> bool:
+        """
+        Merge the result of a processed batch into the state of the fetcher.
+
+        This is called in the main process with the value returned by
+        ``_process_batch``. Subclasses returning more than a success flag, e.g.
+        the latest modified date of the batch, override it to reduce those
+        values instead of sharing them between processes.
+
+        Parameters
+        ----------
+        result : Any
+            The value returned by ``_process_batch``
+
+        Returns
+        -------
+        bool
+            True if successful and more data is available, False if failed or no more data
+        """
+        return result
+
     @staticmethod
     @abstractmethod
     def _process_batch(
@@ -577,8 +630,9 @@ class BaseFetcher(ABC):
 
         Returns
         -------
-        bool
-            True if successful and more data is available, False if failed or no more data
+        Any
+            True if successful and more data is available, False if failed or no
+            more data. See ``_collect_batch_result`` for richer results.
         """
         pass
 
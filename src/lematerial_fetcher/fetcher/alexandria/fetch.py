@@ -4,9 +4,11 @@ import os
 from dataclasses import dataclass
 from datetime import datetime
 from multiprocessing import Manager
-from typing import Any
+from multiprocessing.util import Finalize
+from typing import Any, Optional
 
 import ijson
+import requests
 from tqdm import tqdm
 
 from lematerial_fetcher.database.postgres import StructuresDatabase
@@ -24,6 +26,11 @@ from lematerial_fetcher.utils.io import (
 )
 from lematerial_fetcher.utils.logging import logger
 
+# Per-process resources, opened once by ``_init_worker`` and reused by every
+# batch processed in the same worker process.
+_worker_db: Optional[StructuresDatabase] = None
+_worker_session: Optional[requests.Session] = None
+
 
 @dataclass
 class BatchInfo:
@@ -45,6 +52,75 @@ def get_functional_from_url(url: str) -> Functional:
         raise ValueError(f"Unknown functional: {url}")
 
 
+def _init_worker(config: FetcherConfig) -> None:
+    """
+    Open the database connection and HTTP session used by a worker process.
+
+    Parameters
+    ----------
+    config : FetcherConfig
+        Configuration object
+    """
+    global _worker_db, _worker_session
+    _worker_db = StructuresDatabase(config.db_conn_str, config.table_name)
+    _worker_session = create_session()
+    # Forked pool workers exit without running atexit handlers, finalizers
+    # registered with an exit priority are run by multiprocessing instead
+    Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker() -> None:
+    """Close the database connection and HTTP session of the current process."""
+    global _worker_db, _worker_session
+    if _worker_db is not None:
+        _worker_db.close()
+    if _worker_session is not None:
+        _worker_session.close()
+    _worker_db, _worker_session = None, None
+
+
+def _get_worker_db(config: FetcherConfig) -> StructuresDatabase:
+    """
+    Get the database connection of the current worker process, opening it if needed.
+
+    Parameters
+    ----------
+    config : FetcherConfig
+        Configuration object
+
+    Returns
+    -------
+    StructuresDatabase
+        The database connection of the current worker process
+    """
+    if _worker_db is None:
+        _init_worker(config)
+    return _worker_db
+
+
+def _max_modified(
+    current: Optional[datetime], latest_modified: Optional[datetime]
+) -> Optional[datetime]:
+    """
+    Get the latest of two modified dates, either of which can be missing.
+
+    Parameters
+    ----------
+    current : Optional[datetime]
+        The latest modified date seen so far
+    latest_modified : Optional[datetime]
+        The latest modified date of a batch
+
+    Returns
+    -------
+    Optional[datetime]
+        The latest of the two dates, or None if both are missing
+    """
+    if current is None or (latest_modified is not None and latest_modified > current):
+        return latest_modified
+    return current
+
+
 def read_item(item: Any, latest_modified: datetime) -> RawStructure:
     """
     Convert an API item to a RawStructure.
@@ -63,11 +139,12 @@ def read_item(item: Any, latest_modified: datetime) -> RawStructure:
     """
     last_modified = item["attributes"].get("last_modified", None)
     if last_modified:
-        last_modified = datetime.fromisoformat(last_modified.replace("Z", "+00:00"))
+        # fromisoformat parses the trailing "Z" natively since Python 3.11
+        last_modified = datetime.fromisoformat(last_modified)
         # update the last modified date if it's the latest
         if latest_modified is None or last_modified > latest_modified:
             latest_modified = last_modified
-        last_modified = last_modified.strftime("%Y-%m-%d")
+        last_modified = last_modified.date().isoformat()
     return RawStructure(
         id=item["id"],
         type=item["type"],
@@ -84,8 +161,9 @@ class AlexandriaFetcher(BaseFetcher):
         super().__init__(config or load_fetcher_config(), debug)
         self.manager = Manager()
         self.manager_dict = self.manager.dict()
-        self.manager_dict["latest_modified"] = None
         self.manager_dict["occurred"] = False
+        # Reduced in the main process from the batch results
+        self.latest_modified = None
 
     def setup_resources(self) -> None:
         """Set up necessary resources."""
@@ -116,10 +194,15 @@ class AlexandriaFetcher(BaseFetcher):
         )
         return items_info
 
+    @staticmethod
+    def _init_worker(config: FetcherConfig) -> None:
+        """Open the database connection and HTTP session reused by this worker."""
+        _init_worker(config)
+
     @staticmethod
     def _process_batch(
         batch: Any, config: FetcherConfig, manager_dict: dict, worker_id: int = 0
-    ) -> bool:
+    ) -> tuple[bool, Optional[datetime]]:
         """
         Process a single batch from the Alexandria API.
 
@@ -136,12 +219,13 @@ class AlexandriaFetcher(BaseFetcher):
 
         Returns
         -------
-        bool
-            True if successful and more data is available, False if failed or no more data
+        tuple[bool, Optional[datetime]]
+            True if successful and more data is available, False if failed or no
+            more data, and the latest modified date of the inserted items
         """
         try:
-            db = StructuresDatabase(config.db_conn_str, config.table_name)
-            session = create_session()
+            db = _get_worker_db(config)
+            session = _worker_session
 
             try:
                 # If we didn't have a list of URLs, we could use:
@@ -151,14 +235,15 @@ class AlexandriaFetcher(BaseFetcher):
                 response.raise_for_status()
                 data = response.json()
 
-                # Process and store items
+                # Process and store items, keeping the latest modified date
+                # local to the batch to avoid a shared dict round-trip per item
                 structures = []
+                latest_modified = None
                 for api_item in data.get("data", []):
                     try:
-                        structure, last_modified = read_item(
-                            api_item, manager_dict["latest_modified"]
+                        structure, latest_modified = read_item(
+                            api_item, latest_modified
                         )
-                        manager_dict["latest_modified"] = last_modified
                         structures.append(structure)
                     except Exception as e:
                         logger.warning(
@@ -170,28 +255,32 @@ class AlexandriaFetcher(BaseFetcher):
                 if structures:
                     db.batch_insert_data(structures)
 
-                return len(data.get("data", [])) > 0
+                return len(data.get("data", [])) > 0, latest_modified
 
             except Exception as e:
                 # Check if this is a critical error
-                logger.error(
-                    f"Error processing batch: {str(e)} at offset {batch.offset}"
-                )
+                logger.error(f"Error processing batch: {str(e)} at {batch}")
                 shared_critical_error = BaseFetcher.is_critical_error(e)
                 if shared_critical_error and manager_dict is not None:
                     manager_dict["occurred"] = True  # shared across processes
 
-                return False
-            finally:
-                session.close()
+                return False, None
 
         except Exception as e:
             logger.error(f"Process initialization error: {str(e)}")
-            return False
+            return False, None
+
+    def _collect_batch_result(self, result: tuple[bool, Optional[datetime]]) -> bool:
+        """Keep the latest modified date of the batches whose items were saved."""
+        success, latest_modified = result
+        self.latest_modified = _max_modified(self.latest_modified, latest_modified)
+        return success
 
     def cleanup_resources(self) -> None:
         """Clean up resources."""
         logger.info("Cleaning up Alexandria fetcher resources")
+        # Only opened in the main process in debug mode
+        _close_worker()
 
     def get_new_version(self) -> str:
         """Get a new version string."""
@@ -206,8 +295,9 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
         super().__init__(config or load_fetcher_config(), debug)
         self.manager = Manager()
         self.manager_dict = self.manager.dict()
-        self.manager_dict["latest_modified"] = None
         self.manager_dict["occurred"] = False
+        # Reduced in the main process from the batch results
+        self.latest_modified = None
 
     def setup_resources(self) -> None:
         """Set up necessary resources."""
@@ -232,9 +322,7 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
         for url in urls:
             try:
                 last_modified = url["last_modified"]
-                last_modified = datetime.fromisoformat(
-                    last_modified.replace("Z", "+00:00")
-                )
+                last_modified = datetime.fromisoformat(last_modified)
 
                 if latest_modified is None or last_modified > latest_modified:
                     latest_modified = last_modified
@@ -277,10 +365,15 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
             items=filtered_keys,
         )
 
+    @staticmethod
+    def _init_worker(config: FetcherConfig) -> None:
+        """Open the database connection reused by this worker."""
+        _init_worker(config)
+
     @staticmethod
     def _process_batch(
         batch: Any, config: FetcherConfig, manager_dict: dict, worker_id: int = 0
-    ) -> bool:
+    ) -> tuple[bool, Optional[datetime]]:
         """
         Process a single batch from the Alexandria API.
 
@@ -297,11 +390,12 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
 
         Returns
         -------
-        bool
-            True if successful, False if failed
+        tuple[bool, Optional[datetime]]
+            True if successful, False if failed, and the last modified date of
+            the file once all its items are inserted
         """
         try:
-            db = StructuresDatabase(config.db_conn_str, config.table_name)
+            db = _get_worker_db(config)
             file_url, last_modified, offset = batch
 
             file_path = download_file(
@@ -320,31 +414,34 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
             cleaned_file_path = replace_nan_in_large_json(
                 file_path, file_path.replace(".json", "_cleaned.json")
             )
-            file = open(cleaned_file_path, "r")
-            parser = ijson.kvitems(file, "", use_float=True)
-
-            # Get all keys at the root level
-            for key, item in tqdm(
-                parser,
-                position=worker_id * 2 + 1,  # Position right below its download bar
-                desc=f"Processing {file_url.split('/')[-1]}",
-                leave=False,
-                miniters=100,
-            ):
-                for trajectory in item:
-                    trajectory["functional"] = functional
-
-                raw_structure = RawStructure(
-                    id=key,
-                    type="trajectory",
-                    attributes=item,
-                    last_modified=last_modified,
-                )
-                structures.append(raw_structure)
-
-                if len(structures) % config.log_every == 0:
-                    db.batch_insert_data(structures)
-                    structures = []
+            # ijson parses bytes natively; a large read buffer avoids many small
+            # reads on multi-GB files, and the context manager closes the file
+            # even if parsing fails.
+            with open(cleaned_file_path, "rb", buffering=1 << 20) as file:
+                parser = ijson.kvitems(file, "", use_float=True)
+
+                # Get all keys at the root level
+                for key, item in tqdm(
+                    parser,
+                    position=worker_id * 2 + 1,  # Position right below its download bar
+                    desc=f"Processing {file_url.split('/')[-1]}",
+                    leave=False,
+                    miniters=100,
+                ):
+                    for trajectory in item:
+                        trajectory["functional"] = functional
+
+                    raw_structure = RawStructure(
+                        id=key,
+                        type="trajectory",
+                        attributes=item,
+                        last_modified=last_modified,
+                    )
+                    structures.append(raw_structure)
+
+                    if len(structures) % config.log_every == 0:
+                        db.batch_insert_data(structures)
+                        structures = []
 
             # Insert all remaining structures in a batch
             if structures:
@@ -353,11 +450,8 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
             os.remove(file_path)
             os.remove(cleaned_file_path)
 
-            # Update the latest modified date
-            manager_dict["latest_modified"] = last_modified
-
             gc.collect()
-            return True
+            return True, last_modified
 
         except Exception as e:
             # Check if this is a critical error
@@ -370,16 +464,22 @@ class AlexandriaTrajectoryFetcher(BaseFetcher):
             if os.path.exists(cleaned_file_path):
                 os.remove(cleaned_file_path)
             gc.collect()
-            return False
+            return False, None
+
+    def _collect_batch_result(self, result: tuple[bool, Optional[datetime]]) -> bool:
+        """Keep the latest modified date of the files whose items were saved."""
+        success, latest_modified = result
+        self.latest_modified = _max_modified(self.latest_modified, latest_modified)
+        return success
 
     def cleanup_resources(self) -> None:
         """Clean up resources."""
         logger.info("Cleaning up Alexandria fetcher resources")
+        # Only opened in the main process in debug mode
+        _close_worker()
 
     def get_new_version(self) -> str:
         """Get a new version string."""
         return (
-            self.manager_dict["latest_modified"]
-            if self.manager_dict["latest_modified"]
-            else datetime.min.isoformat()
+            self.latest_modified if self.latest_modified else datetime.min.isoformat()
         )
@@ -47,7 +47,7 @@ def replace_nan_in_large_json(
 
         with (
             open(input_filepath, "r", encoding="utf-8", errors="replace") as f_in,
-            open(output_filepath, "w", encoding="utf-8") as f_out,
+            open(output_filepath, "w", encoding="utf-8", buffering=chunk_size) as f_out,
         ):
             carry_over = ""  # Stores potential trailing part of NaN from previous chunk
             while True:
@@ -1,11 +1,21 @@
 # Copyright 2025 Entalpic
-import ast
+import re
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime
-from typing import Any, Optional, Type
+from functools import lru_cache, partial
+from itertools import groupby, islice
+from multiprocessing import Event
+from operator import itemgetter
+from typing import Any, Callable, Generator, Iterator, Optional, TypeVar
 
-from pymatgen.core import Structure
+import numpy as np
 
 from lematerial_fetcher.database.mysql import MySQLDatabase
 from lematerial_fetcher.database.postgres import (
@@ -16,95 +26,207 @@ from lematerial_fetcher.database.postgres import (
 from lematerial_fetcher.models.models import RawStructure
 from lematerial_fetcher.models.optimade import Functional, OptimadeStructure
 from lematerial_fetcher.models.trajectories import Trajectory, has_trajectory_converged
-from lematerial_fetcher.transform import BaseTransformer, TDatabase, TStructure
-from lematerial_fetcher.utils.config import TransformerConfig
+from lematerial_fetcher.transform import (
+    BaseTransformer,
+    close_worker,
+    init_worker,
+    worker_state,
+)
 from lematerial_fetcher.utils.logging import logger
 from lematerial_fetcher.utils.structure import (
-    get_optimade_from_pymatgen,
+    get_optimade_composition_fields_from_sites,
+    get_optimade_from_sites,
     stress_matrix_from_voigt_6_stress,
 )
 
+T = TypeVar("T")
+
+# Column getters for the OQMD structures table, built once so that each row is
+# unpacked with a single call instead of a Python loop over the keys.
+_STRESS_TENSOR_COLUMNS = ("sxx", "syy", "szz", "syz", "szx", "sxy")
+_STRESS_TENSOR_GETTER = itemgetter(*_STRESS_TENSOR_COLUMNS)
+_LATTICE_VECTORS_COLUMNS = ("x1", "y1", "z1", "x2", "y2", "z2", "x3", "y3", "z3")
+_LATTICE_VECTORS_GETTER = itemgetter(*_LATTICE_VECTORS_COLUMNS)
+_STRUCTURE_MAPPING_KEYS = {
+    "chemical_formula_descriptive": "composition_id",
+    "nsites": "nsites",
+    "nelements": "ntypes",
+    "total_magnetization": "magmom",
+}
+_STRUCTURE_MAPPING_GETTER = itemgetter(*_STRUCTURE_MAPPING_KEYS.values())
+# Only the columns used by the transformers are read from the structures and
+# calculations tables
+_STRUCTURE_COLUMNS = (
+    "id",
+    "entry_id",
+    "energy",
+    *_STRUCTURE_MAPPING_KEYS.values(),
+    *_LATTICE_VECTORS_COLUMNS,
+    *_STRESS_TENSOR_COLUMNS,
+)
+_CALCULATION_COLUMNS = (
+    "id",
+    "entry_id",
+    "label",
+    "settings",
+    "energy",
+    "energy_pa",
+    "band_gap",
+    "input_id",
+    "output_id",
+    "nsteps",
+    "converged",
+)
+_ENTRY_ID_GETTER = itemgetter("entry_id")
+_STRUCTURE_ID_GETTER = itemgetter("structure_id")
+# Numeric columns of the atoms table: fractional coordinates, forces and charge
+_ATOM_VALUE_COLUMNS = ("x", "y", "z", "fx", "fy", "fz", "charge")
+_ATOM_VALUES_GETTER = itemgetter(*_ATOM_VALUE_COLUMNS)
+# Only the columns used by the transformers are read from the atoms table
+_ATOM_COLUMNS = ("structure_id", "element_id", *_ATOM_VALUE_COLUMNS)
+# Fields taken from the composition, the descriptive formula and the number of
+# elements come from the OQMD structures table instead
+_COMPOSITION_KEEP_COLS = (
+    "chemical_formula_anonymous",
+    "elements",
+    "elements_ratios",
+    "chemical_formula_reduced",
+    "species",
+)
+_COMPOSITION_KEEP_GETTER = itemgetter(*_COMPOSITION_KEEP_COLS)
+# Structures containing one of these elements are not cross compatible
+_EXCLUDE_ELEMENTS = frozenset(
+    ["Yb", "W", "Tl", "Eu", "Ce", "Rh", "Ru", "Mo", "Mn", "Cr", "V", "Ti", "Ca"]
+)
+
+# Only the ``ispin`` entry of the calculation settings is needed, so it is read
+# directly from the serialized dict instead of parsing the whole string
+_ISPIN_RE = re.compile(r"['\"]ispin['\"]\s*:\s*['\"]?(\d+)")
+
+
+@lru_cache(maxsize=1024)
+def _is_spin_polarized(settings: str) -> bool:
+    """Check whether serialized OQMD calculation settings have ``ispin`` set to 2.
+
+    Settings strings repeat heavily across calculations, hence the cache.
+
+    Parameters
+    ----------
+    settings : str
+        The settings of the calculation, as a serialized Python dict
+
+    Returns
+    -------
+    bool
+        True if the calculation is spin polarized, False otherwise
+    """
+    match = _ISPIN_RE.search(settings)
+    return match is not None and match.group(1) == "2"
+
+
+def _placeholders(count: int) -> str:
+    """Build the placeholders of a parameterized ``IN (...)`` clause.
+
+    Parameters
+    ----------
+    count : int
+        The number of values in the clause
+
+    Returns
+    -------
+    str
+        ``count`` comma separated ``%s`` placeholders
+    """
+    return ", ".join(["%s"] * count)
+
+
+def _prefetch(iterator: Iterator[T]) -> Generator[T, None, None]:
+    """
+    Yield the items of an iterator while the next one is produced in a thread.
+
+    Used to read the next page of the source table while the current one is
+    being dispatched to the workers. The iterator must not yield None.
+
+    Parameters
+    ----------
+    iterator : Iterator[T]
+        The iterator to prefetch from
+
+    Yields
+    ------
+    T
+        The items of the iterator, in order
+    """
+    # Leaving the executor waits for an in-flight fetch, so the iterator is not
+    # used anymore once the generator is closed
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_item = executor.submit(next, iterator, None)
+        while (item := next_item.result()) is not None:
+            next_item = executor.submit(next, iterator, None)
+            yield item
+
 
 def process_batch(
     batch_id: int,
-    offset: int,
-    batch_size: int,
+    first_id: Any,
+    last_id: Any,
+    table_name: str,
     task_table_name: Optional[str],
-    config: TransformerConfig,
-    database_class: Type[TDatabase],
-    structure_class: Type[TStructure],
-    transformer_class: Type["BaseTransformer[TDatabase, TStructure]"],
-    manager_dict: dict,
 ) -> None:
     """
     Process a batch of rows in a worker process.
 
+    The configuration, database connections and transformer are those set up
+    by ``init_worker``, which must have been called in the current process.
+    The rows are read by the worker itself, so that only their ID range is
+    sent from the main process.
+
     Parameters
     ----------
     batch_id : int
         Identifier for the batch
-    offset : int
-        The offset to start fetching rows from
-    batch_size : int
-        The number of rows to fetch
+    first_id : Any
+        The ID of the first row of the batch
+    last_id : Any
+        The ID of the last row of the batch
+    table_name : str
+        The name of the source table to transform
     task_table_name : Optional[str]
         Task table name to read targets or trajectories from.
         This is only used for Materials Project.
-    config : TransformerConfig
-        Configuration object
-    database_class : Type[TDatabase]
-        The class to use for the target database
-    structure_class : Type[TStructure]
-        The class to use for the transformed structures
-    transformer_class : Type["BaseTransformer[TDatabase, TStructure]"]
-        The transformer class to use for transformation
-    manager_dict : dict
-        Shared dictionary to signal critical errors across processes
     """
-    try:
-        # Create new database connections for this process
-        source_db = MySQLDatabase(
-            **config.mysql_config,
-        )
-        target_db = database_class(config.dest_db_conn_str, config.dest_table_name)
-
-        # transform the rows into TStructure objects
-        transformer = transformer_class(
-            config=config,
-            database_class=database_class,
-            structure_class=structure_class,
-        )
+    # Batches queued before a critical error in another worker are skipped
+    if worker_state.critical_event.is_set():
+        return
 
+    config = worker_state.config
+    try:
         processed_count = 0
-        if database_class == OptimadeDatabase:
-            table_source = "structures"
-        elif database_class == TrajectoriesDatabase:
-            table_source = "entries"
 
-        rows = source_db.fetch_items(
-            offset=offset, batch_size=batch_size, table_name=table_source
+        rows = worker_state.source_db.fetch_items_between_ids(
+            first_id,
+            last_id,
+            table_name,
+            columns=", ".join(worker_state.transformer.source_columns),
         )
-
-        structures = transformer.transform_row(
-            rows, source_db=source_db, task_table_name=task_table_name
+        structures = worker_state.transformer.transform_row(
+            rows, source_db=worker_state.source_db, task_table_name=task_table_name
         )
 
-        target_db.batch_insert_data(structures)
+        worker_state.target_db.batch_insert_data(
+            structures, batch_size=config.insert_batch_size
+        )
 
         processed_count += 1
         if processed_count % config.log_every == 0:
             logger.info(
-                f"Transformed {batch_id * batch_size + processed_count} records"
+                f"Transformed {batch_id * config.batch_size + processed_count} records"
             )
 
     except Exception as e:
-        logger.error(f"Process initialization error: {str(e)}")
+        logger.error(f"Error processing batch {batch_id}: {str(e)}")
         if BaseTransformer.is_critical_error(e):
-            manager_dict["occurred"] = True  # shared across processes
-
-    finally:
-        source_db.close()
-        target_db.close()
+            worker_state.critical_event.set()  # shared across processes
 
 
 class BaseOQMDTransformer(BaseTransformer):
@@ -113,6 +235,9 @@ class BaseOQMDTransformer(BaseTransformer):
     Transforms raw OQMD data into OptimadeStructures.
     """
 
+    # Columns of the source table read by the workers for transform_row
+    source_columns: tuple[str, ...] = ("*",)
+
     def get_new_transform_version(self) -> str:
         """
         Get the new transform version based on the latest processed data.
@@ -137,6 +262,91 @@ class BaseOQMDTransformer(BaseTransformer):
         except Exception:
             return super().get_new_transform_version()
 
+    def _source_db_factory(self) -> Callable[[], MySQLDatabase]:
+        """
+        Get the callable opening a connection to the OQMD MySQL database.
+
+        Returns
+        -------
+        Callable[[], MySQLDatabase]
+            Callable returning a new source database connection
+        """
+        return partial(MySQLDatabase, **self.config.mysql_config)
+
+    def _iter_source_batches(
+        self, source_db: MySQLDatabase, table_name: str
+    ) -> Iterator[list[Any]]:
+        """
+        Page through the IDs of the source table, starting at the configured offset.
+
+        Keyset pagination keeps every page an index range scan, whereas
+        LIMIT/OFFSET rescans all the previous rows, and an empty page tells
+        that there is no more data without any extra probe query. Only the IDs
+        are read here, the rows of a page are read by the worker processing it.
+
+        Parameters
+        ----------
+        source_db : MySQLDatabase
+            The source database connection
+        table_name : str
+            The name of the table to page through
+
+        Yields
+        ------
+        list[Any]
+            The IDs of the rows of each page, in order
+        """
+        last_id = None
+        if self.config.page_offset > 0:
+            last_id = source_db.get_id_at_offset(
+                self.config.page_offset - 1, table_name
+            )
+            if last_id is None:
+                return
+
+        while True:
+            rows = source_db.fetch_items_after_id(
+                last_id, self.config.batch_size, table_name, columns="id"
+            )
+            if not rows:
+                return
+            ids = [row["id"] for row in rows]
+            yield ids
+            last_id = ids[-1]
+
+    def _submit_batch(
+        self,
+        executor: ProcessPoolExecutor,
+        batch_id: int,
+        ids: list[Any],
+        table_name: str,
+        task_table_name: Optional[str],
+    ) -> Future:
+        """
+        Submit a page of source rows to be transformed by a worker process.
+
+        Parameters
+        ----------
+        executor : ProcessPoolExecutor
+            The process pool
+        batch_id : int
+            Identifier for the batch
+        ids : list[Any]
+            The IDs of the rows of the source table to transform, in order
+        table_name : str
+            The name of the source table
+        task_table_name : Optional[str]
+            Task table name to read targets or trajectories from
+
+        Returns
+        -------
+        Future
+            The future of the batch
+        """
+        return executor.submit(
+            process_batch, batch_id, ids[0], ids[-1], table_name, task_table_name
+        )
+
     def _process_rows(self) -> None:
         """
         Process rows from source database in parallel, transform them, and store in target database.
@@ -148,165 +358,103 @@ class BaseOQMDTransformer(BaseTransformer):
         Exception
             If a critical error occurs during processing
         """
-        batch_size = self.config.batch_size
-        offset = self.config.page_offset
         total_processed = 0
         task_table_name = self.config.mp_task_table_name
         table_name = (
             "structures" if self._database_class == OptimadeDatabase else "entries"
         )
 
-        if self.debug:
-            # Debug mode: process in main process
-            while True:
-                # Process batch in main process
-                process_batch(
-                    offset // batch_size,  # batch_id
-                    offset,
-                    batch_size,
-                    task_table_name,
-                    self.config,
-                    self._database_class,
-                    self._structure_class,
-                    self.__class__,
-                    self.manager_dict,
-                )
+        # A single connection in the main process pages through the IDs of the
+        # source table and hands their ranges to the workers
+        source_db = MySQLDatabase(**self.config.mysql_config)
+        # The next page is read while the current one is handed to a worker
+        pages = _prefetch(self._iter_source_batches(source_db, table_name))
+        try:
+            batches = enumerate(pages)
 
-                # Check if we should continue
-                source_db = MySQLDatabase(
-                    **self.config.mysql_config,
-                )
-                rows = source_db.fetch_items(
-                    offset=offset + batch_size, batch_size=1, table_name=table_name
-                )
-                source_db.close()
-                if not rows:
-                    break
-
-                total_processed += batch_size
-                logger.info(f"Total processed: {total_processed}")
-                offset += batch_size
-
-            logger.info(f"Completed processing {total_processed} total rows")
-            return
-
-        # Normal mode: process in parallel with work stealing
-        with ProcessPoolExecutor(max_workers=self.config.num_workers) as executor:
-            futures = set()
-
-            # Submit initial batch of tasks
-            for i in range(self.config.num_workers):
-                future = executor.submit(
-                    process_batch,
-                    offset // batch_size,  # batch_id
-                    offset + (i * batch_size),
-                    batch_size,
-                    task_table_name,
-                    self.config,
-                    self._database_class,
-                    self._structure_class,
-                    self.__class__,
-                    self.manager_dict,
-                )
-                futures.add((offset + (i * batch_size), future))
-                total_processed += batch_size
+            critical_event = Event()
+            worker_context = self._worker_context(critical_event)
 
-            offset += batch_size * self.config.num_workers
-            more_data = True
+            if self.debug:
+                # Debug mode: process in main process
+                init_worker(*worker_context)
+                try:
+                    for batch_id, ids in batches:
+                        process_batch(
+                            batch_id, ids[0], ids[-1], table_name, task_table_name
+                        )
 
-            while futures and more_data:
-                # Check for completed futures and remove them
-                done_futures = set()
-                for current_offset, future in futures:
-                    if future.done():
+                        total_processed += len(ids)
+                        logger.info(f"Total processed: {total_processed}")
+                finally:
+                    close_worker()
+
+                logger.info(f"Completed processing {total_processed} total rows")
+                return
+
+            # Normal mode: process in parallel with work stealing
+            with ProcessPoolExecutor(
+                max_workers=self.config.num_workers,
+                initializer=init_worker,
+                initargs=worker_context,
+            ) as executor:
+                pending: dict[Future, int] = {}
+
+                # Submit initial batch of tasks
+                initial_batches = (
+                    self.batches_in_flight_per_worker * self.config.num_workers
+                )
+                for batch_id, ids in islice(batches, initial_batches):
+                    future = self._submit_batch(
+                        executor, batch_id, ids, table_name, task_table_name
+                    )
+                    pending[future] = batch_id
+                    total_processed += len(ids)
+
+                more_data = True
+                # The last batches still go through the shutdown path below once
+                # there are no more pages to submit
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch_id = pending.pop(future)
                         try:
                             future.result()
-
-                            if self.manager_dict.get("occurred", False):
-                                logger.critical(
-                                    "Critical error detected, shutting down process pool"
-                                )
-                                executor.shutdown(wait=False)
+                            if critical_event.is_set():
                                 raise RuntimeError(
                                     "Critical error occurred during processing"
                                 )
-
-                            # Check if there might be more data
-                            source_db = MySQLDatabase(
-                                **self.config.mysql_config,
-                            )
-                            # Check that there is more data
-                            check_rows = source_db.fetch_items(
-                                offset=offset, batch_size=1, table_name=table_name
-                            )
-                            source_db.close()
-
-                            if check_rows:
-                                # Submit new task
-                                next_future = executor.submit(
-                                    process_batch,
-                                    offset // batch_size,  # batch_id
-                                    offset,
-                                    batch_size,
-                                    task_table_name,
-                                    self.config,
-                                    self._database_class,
-                                    self._structure_class,
-                                    self.__class__,
-                                    self.manager_dict,
-                                )
-                                futures.add((offset, next_future))
-                                offset += batch_size
-                            else:
-                                more_data = False
-
-                            logger.info(
-                                f"Successfully processed batch at offset {current_offset}"
-                            )
-
                         except Exception as e:
-                            logger.error(f"Critical error encountered: {str(e)}")
-                            executor.shutdown(wait=False)
+                            logger.critical(
+                                f"Critical error encountered, shutting down process pool: {str(e)}"
+                            )
+                            executor.shutdown(wait=False, cancel_futures=True)
                             raise
 
-                        done_futures.add((current_offset, future))
-                        break
+                        logger.info(f"Successfully processed batch {batch_id}")
 
-                futures -= done_futures
+                        # Submit the next page if there is one
+                        batch = next(batches, None) if more_data else None
+                        if batch is None:
+                            more_data = False
+                            continue
+                        next_future = self._submit_batch(
+                            executor, *batch, table_name, task_table_name
+                        )
+                        pending[next_future] = batch[0]
+                        total_processed += len(batch[1])
 
-            # Wait for remaining futures
-            for current_offset, future in futures:
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(
-                        f"Error processing batch at offset {current_offset}: {str(e)}"
-                    )
-
-            logger.info(
-                f"Completed processing approximately {total_processed} total rows"
-            )
+                logger.info(f"Completed processing {total_processed} total rows")
+        finally:
+            pages.close()
+            source_db.close()
 
     @property
-    def exclude_elements(self) -> list[str]:
+    def exclude_elements(self) -> frozenset[str]:
         """
         Getter for excluded elements.
         """
-        return [
-            "Yb",
-            "W",
-            "Tl",
-            "Eu",
-            "Ce",
-            "Rh",
-            "Ru",
-            "Mo",
-            "Mn",
-            "Cr",
-            "V",
-            "Ti",
-            "Ca",
-        ]
+        return _EXCLUDE_ELEMENTS
 
     def _get_calculations(
         self,
@@ -343,45 +491,58 @@ class BaseOQMDTransformer(BaseTransformer):
             raw_structure["id"]: raw_structure[entry_id_key]
             for raw_structure in raw_structures
         }
-        entry_ids = [
-            str(entry_id)
+        # Different structures can share an entry_id, only query each one once
+        entry_ids = {
+            entry_id
             for entry_id in structure_id_to_entry_id.values()
             if entry_id is not None
-        ]
-        # Get a list of all the calculations for the entry_ids
+        }
+        if not entry_ids:
+            return {}
+
+        # Get a list of all the calculations for the entry_ids, ordered so that they
+        # come grouped by entry_id (the index on entry_id already returns that order)
         custom_query = (
-            f"SELECT * FROM calculations WHERE entry_id IN ({', '.join(entry_ids)})"
+            f"SELECT {', '.join(_CALCULATION_COLUMNS)} FROM calculations "
+            f"WHERE entry_id IN ({_placeholders(len(entry_ids))}) "
+            "ORDER BY entry_id, id"
+        )
+        fetched_calculations = source_db.fetch_items(
+            query=custom_query, params=tuple(entry_ids)
         )
-        fetched_calculations = source_db.fetch_items(query=custom_query)
-
-        # We need to group the calculations by entry_id because different structures can have the same entry_id
-        calculations_by_entry_id = defaultdict(list)
-        for calculation in fetched_calculations:
-            calculations_by_entry_id[calculation["entry_id"]].append(calculation)
-
-        # Group the calculations by structure_id
-        calculations = defaultdict(list)
-        for structure_id in structure_id_to_entry_id.keys():
-            # The structure has no entry_id, so we skip it
-            if structure_id_to_entry_id[structure_id] is None:
-                continue
 
-            calculations[structure_id] = calculations_by_entry_id[
-                structure_id_to_entry_id[structure_id]
-            ]
+        label_rank = (
+            {label: rank for rank, label in enumerate(filter_label)}
+            if filter_label
+            else None
+        )
 
-            if filter_label:
-                # Filter and sort calculations based on label order
-                calculations[structure_id] = sorted(
-                    [
+        # We need to group the calculations by entry_id because different structures can have the same entry_id
+        calculations_by_entry_id = {}
+        for entry_id, entry_calculations in groupby(
+            fetched_calculations, key=_ENTRY_ID_GETTER
+        ):
+            if label_rank is None:
+                calculations_by_entry_id[entry_id] = list(entry_calculations)
+            else:
+                # Filter and sort calculations based on label order, once per
+                # entry_id rather than once per structure sharing it
+                calculations_by_entry_id[entry_id] = sorted(
+                    (
                         calc
-                        for calc in calculations[structure_id]
-                        if calc["label"] in filter_label
-                    ],
-                    key=lambda x: filter_label.index(x["label"]),
+                        for calc in entry_calculations
+                        if calc["label"] in label_rank
+                    ),
+                    key=lambda calc: label_rank[calc["label"]],
                 )
 
-        return calculations
+        # Group the calculations by structure_id, structures without an entry_id
+        # are skipped
+        return {
+            structure_id: calculations_by_entry_id.get(entry_id, [])
+            for structure_id, entry_id in structure_id_to_entry_id.items()
+            if entry_id is not None
+        }
 
     def _get_atoms_from_structure_id(
         self, structure_ids: list[int], source_db: MySQLDatabase
@@ -401,20 +562,35 @@ class BaseOQMDTransformer(BaseTransformer):
         dict[str, list[dict[str, Any]]]
             The atoms from the structure IDs
         """
+        atoms_dict = defaultdict(list)
+        structure_ids = set(structure_ids)
+        if not structure_ids:
+            return atoms_dict
 
+        # Atoms come grouped by structure, in their site order
         atoms = source_db.fetch_items(
-            query=f"SELECT * FROM atoms WHERE structure_id IN ({', '.join(map(str, structure_ids))})"
+            query=(
+                f"SELECT {', '.join(_ATOM_COLUMNS)} FROM atoms "
+                f"WHERE structure_id IN ({_placeholders(len(structure_ids))}) "
+                "ORDER BY structure_id, id"
+            ),
+            params=tuple(structure_ids),
         )
 
-        atoms_dict = defaultdict(list)
-        for atom in atoms:
-            atoms_dict[atom["structure_id"]].append(atom)
+        atoms_dict.update(
+            (structure_id, list(structure_atoms))
+            for structure_id, structure_atoms in groupby(
+                atoms, key=_STRUCTURE_ID_GETTER
+            )
+        )
 
         return atoms_dict
 
     def _extract_atoms_attributes(
         self, atoms: list[dict[str, Any]]
-    ) -> tuple[list[str], list[list[float]], list[list[float]], list[float]]:
+    ) -> tuple[
+        list[str], np.ndarray, Optional[list[list[float]]], Optional[list[float]]
+    ]:
         """
         Extract the attributes of the atoms from the atoms table.
 
@@ -427,26 +603,26 @@ class BaseOQMDTransformer(BaseTransformer):
         -------
         species_at_sites : list[str]
             The species at sites
-        frac_coords : list[list[float]]
-            The fractional coordinates of the atoms
-        forces : list[list[float]]
-            The forces on the atoms
-        charges : list[float]
-            The charges on the atoms
+        frac_coords : np.ndarray
+            The fractional coordinates of the atoms, of shape (n_atoms, 3)
+        forces : Optional[list[list[float]]]
+            The forces on the atoms, None if any component is missing
+        charges : Optional[list[float]]
+            The charges on the atoms, None if any charge is missing
         """
-
-        species_at_sites, frac_coords, forces, charges = [], [], [], []
-        for atom in atoms:
-            species_at_sites.append(atom["element_id"])
-            frac_coords.append([atom["x"], atom["y"], atom["z"]])
-            forces.append([atom["fx"], atom["fy"], atom["fz"]])
-            charges.append(atom["charge"])
-
-        if any(charge is None for charge in charges):
-            charges = None
-
-        if any(any(f is None for f in force) for force in forces):
-            forces = None
+        species_at_sites = [atom["element_id"] for atom in atoms]
+        # All the numeric columns are read in a single pass into one (n_atoms, 7)
+        # array and sliced per attribute. Missing values (NULL columns) become NaN
+        # in float arrays, so a single vectorized check replaces the Python scans
+        values = np.array(
+            [_ATOM_VALUES_GETTER(atom) for atom in atoms], dtype=np.float64
+        ).reshape(-1, 7)
+        frac_coords = values[:, :3]
+        forces = values[:, 3:6]
+        charges = values[:, 6]
+
+        forces = None if np.isnan(forces).any() else forces.tolist()
+        charges = None if np.isnan(charges).any() else charges.tolist()
 
         return species_at_sites, frac_coords, forces, charges
 
@@ -467,29 +643,15 @@ class BaseOQMDTransformer(BaseTransformer):
             The base attributes of the raw OQMD structure
         """
 
-        stress_tensor_keys = ["sxx", "syy", "szz", "syz", "szx", "sxy"]
-        stress_tensor = [raw_structure[key] for key in stress_tensor_keys]
-        lattice_vectors_keys = [
-            ["x1", "y1", "z1"],
-            ["x2", "y2", "z2"],
-            ["x3", "y3", "z3"],
-        ]
-        lattice_vectors = [
-            [raw_structure[key] for key in keys] for keys in lattice_vectors_keys
-        ]
-
-        structure_mapping_keys = {
-            "chemical_formula_descriptive": "composition_id",
-            "nsites": "nsites",
-            "nelements": "ntypes",
-            "total_magnetization": "magmom",
-        }
+        x1, y1, z1, x2, y2, z2, x3, y3, z3 = _LATTICE_VECTORS_GETTER(raw_structure)
 
-        values_dict = {}
-        for key, value in structure_mapping_keys.items():
-            values_dict[key] = raw_structure[value]
-        values_dict["lattice_vectors"] = lattice_vectors
-        values_dict["stress_tensor"] = stress_matrix_from_voigt_6_stress(stress_tensor)
+        values_dict = dict(
+            zip(_STRUCTURE_MAPPING_KEYS, _STRUCTURE_MAPPING_GETTER(raw_structure))
+        )
+        values_dict["lattice_vectors"] = [[x1, y1, z1], [x2, y2, z2], [x3, y3, z3]]
+        values_dict["stress_tensor"] = stress_matrix_from_voigt_6_stress(
+            _STRESS_TENSOR_GETTER(raw_structure)
+        )
         values_dict["immutable_id"] = f"oqmd-{raw_structure['id']}"
         values_dict["energy"] = raw_structure["energy"]  # might be None
 
@@ -504,6 +666,8 @@ class OQMDTransformer(
     Transforms raw OQMD data into OptimadeStructures.
     """
 
+    source_columns = _STRUCTURE_COLUMNS
+
     def transform_row(
         self,
         raw_structures: list[RawStructure | dict[str, Any]],
@@ -532,39 +696,40 @@ class OQMDTransformer(
             If the list is empty, nothing from the structure should be included in the database.
         """
 
-        values_dict_dict = {
-            raw_structure["id"]: self._extract_structures_attributes(raw_structure)
-            for raw_structure in raw_structures
-        }
+        # Couldn't find a way to get the last modified date from the source database,
+        # the transformation date is used for the whole batch instead
+        last_modified = datetime.now().isoformat()
 
         calculations_dict = self._get_calculations(
             raw_structures, source_db, filter_label=["static"]
         )  # same order as raw_structures
 
-        atoms = self._get_atoms_from_structure_id(
-            list(calculations_dict.keys()), source_db
-        )
-
-        optimade_structures = []
-        for raw_structure, structure_id in zip(
-            raw_structures, calculations_dict.keys()
-        ):
-            if structure_id not in calculations_dict:
-                continue
-
-            calculations = calculations_dict[structure_id]
-            values_dict = values_dict_dict[structure_id]
-
+        # Structures without a usable static calculation are skipped before their
+        # attributes are extracted and their atoms are fetched
+        static_calculations = {}
+        for structure_id, calculations in calculations_dict.items():
             if len(calculations) == 0:
                 logger.warning(f"No static calculation found for {structure_id}")
                 continue
-            static_calculation = calculations[0]
-
-            if static_calculation["energy_pa"] is None:
+            if calculations[0]["energy_pa"] is None:
                 logger.warning(
                     f"No energy_pa found for structure {structure_id}, skipping"
                 )
                 continue
+            static_calculations[structure_id] = calculations[0]
+
+        atoms = self._get_atoms_from_structure_id(
+            list(static_calculations.keys()), source_db
+        )
+        raw_structures_by_id = {
+            raw_structure["id"]: raw_structure for raw_structure in raw_structures
+        }
+
+        optimade_structures = []
+        for structure_id, static_calculation in static_calculations.items():
+            values_dict = self._extract_structures_attributes(
+                raw_structures_by_id[structure_id]
+            )
 
             values_dict["energy"] = (
                 static_calculation["energy_pa"] * values_dict["nsites"]
@@ -574,53 +739,41 @@ class OQMDTransformer(
             species_at_sites, frac_coords, forces, charges = (
                 self._extract_atoms_attributes(atoms[structure_id])
             )
-            structure = Structure(
-                species=species_at_sites,
-                coords=frac_coords,
-                lattice=values_dict["lattice_vectors"],
-                coords_are_cartesian=False,
+            # Only the composition is needed on top of the coordinates, so no
+            # pymatgen Structure is built here (OptimadeStructure builds its own)
+            cartesian_site_positions = np.dot(
+                frac_coords, values_dict["lattice_vectors"]
             )
-            cartesian_site_positions = structure.cart_coords
             values_dict["species_at_sites"] = species_at_sites
             values_dict["cartesian_site_positions"] = cartesian_site_positions
             values_dict["forces"] = forces
             values_dict["charges"] = charges
 
-            optimade_keys_from_structure = get_optimade_from_pymatgen(structure)
-            keep_cols = [
-                "chemical_formula_anonymous",
-                "elements",
-                "elements_ratios",
-                "chemical_formula_reduced",
-                "dimension_types",
-                "nperiodic_dimensions",
-                "species",
-            ]
-            for key in keep_cols:
-                values_dict[key] = optimade_keys_from_structure[key]
+            optimade_keys_from_composition = get_optimade_composition_fields_from_sites(
+                species_at_sites
+            )
+            values_dict.update(
+                zip(
+                    _COMPOSITION_KEEP_COLS,
+                    _COMPOSITION_KEEP_GETTER(optimade_keys_from_composition),
+                )
+            )
+            values_dict["dimension_types"] = [1, 1, 1]
+            values_dict["nperiodic_dimensions"] = 3
 
             values_dict["functional"] = Functional.PBE
             # Compatibility of the DFT settings
-            # dict from string to dict
-            settings = ast.literal_eval(static_calculation["settings"])
-            if settings.get("ispin", None) in ["2", 2]:
-                values_dict["cross_compatibility"] = True
-            else:
-                values_dict["cross_compatibility"] = False
-
-            if any(
-                element in values_dict["elements"] for element in self.exclude_elements
-            ):
-                # TODO(Ramlaoui): Do we just want to skip the structure or set cross_compatibility to False?
-                values_dict["cross_compatibility"] = False
+            # TODO(Ramlaoui): Do we just want to skip the structure or set cross_compatibility to False?
+            values_dict["cross_compatibility"] = self.exclude_elements.isdisjoint(
+                species_at_sites
+            ) and _is_spin_polarized(static_calculation["settings"])
 
             try:
                 optimade_structure = OptimadeStructure(
                     **values_dict,
                     id=f"{values_dict['immutable_id']}-{Functional.PBE.value}",
                     source="oqmd",
-                    # Couldn't find a way to get the last modified date from the source database
-                    last_modified=datetime.now().isoformat(),
+                    last_modified=last_modified,
                     compute_space_group=True,
                     compute_bawl_hash=True,
                 )
@@ -640,6 +793,10 @@ class OQMDTrajectoryTransformer(
     Transforms raw OQMD data into Trajectory objects.
     """
 
+    # Only the IDs of the entries are used, everything else comes from their
+    # calculations and structures
+    source_columns = ("id",)
+
     def __init__(self, *args, **kwargs):
         if "structure_class" in kwargs:
             del kwargs["structure_class"]
@@ -658,8 +815,17 @@ class OQMDTrajectoryTransformer(
         """
         Get a structure from a structure ID.
         """
-        query = f"SELECT * FROM structures WHERE id IN ({', '.join(map(str, structure_ids))})"
-        raw_structures = source_db.fetch_items(query=query)
+        # Calculation steps share structures (the output of a step is the input of
+        # the next one), so only query each structure once
+        structure_ids = set(structure_ids)
+        if not structure_ids:
+            return {}
+
+        query = (
+            f"SELECT {', '.join(_STRUCTURE_COLUMNS)} FROM structures "
+            f"WHERE id IN ({_placeholders(len(structure_ids))})"
+        )
+        raw_structures = source_db.fetch_items(query=query, params=tuple(structure_ids))
         return {raw_structure["id"]: raw_structure for raw_structure in raw_structures}
 
     def transform_row(
@@ -689,6 +855,10 @@ class OQMDTrajectoryTransformer(
         list[Trajectory]
             The transformed Trajectory objects.
         """
+        # The last modified date is not available for OQMD, the transformation date
+        # is used for the whole batch instead
+        last_modified = datetime.now().isoformat()
+
         calculations_dict = self._get_calculations(
             raw_structures,
             source_db,
@@ -721,19 +891,13 @@ class OQMDTrajectoryTransformer(
                     self._extract_atoms_attributes(atoms)
                 )
 
-                structure = Structure(
-                    species=species_at_sites,
-                    coords=frac_coords,
-                    lattice=values_dict["lattice_vectors"],
-                    coords_are_cartesian=False,
+                optimade_keys_from_sites = get_optimade_from_sites(
+                    species_at_sites, frac_coords, values_dict["lattice_vectors"]
                 )
-                optimade_keys_from_structure = get_optimade_from_pymatgen(structure)
 
                 values_dict = {
                     **values_dict,
-                    **optimade_keys_from_structure,
-                    "species_at_sites": species_at_sites,
-                    "cartesian_site_positions": structure.cart_coords,
+                    **optimade_keys_from_sites,
                     "forces": forces,
                     "charges": charges,
                 }
@@ -744,29 +908,20 @@ class OQMDTrajectoryTransformer(
 
             return values_dict_dict
 
-        # Get all the structure IDs from the calculations
-        # some of them might be None so we need to filter them out to avoid errors
-        flattened_structure_ids = [
-            structure_id
-            for _, calculations in calculations_dict.items()
-            for calculation in calculations
-            for structure_id in (calculation["input_id"], calculation["output_id"])
-            if structure_id is not None
-        ]
-        entry_id_to_ignore = set(
-            [
-                entry_id
-                for entry_id, calculations in calculations_dict.items()
+        # Get all the structure IDs from the calculations in a single pass
+        # some of them might be None, the whole entry is then ignored
+        flattened_structure_ids = []
+        entry_id_to_ignore = set()
+        for entry_id, calculations in calculations_dict.items():
+            entry_structure_ids = [
+                structure_id
                 for calculation in calculations
                 for structure_id in (calculation["input_id"], calculation["output_id"])
-                if structure_id is None
             ]
-        )
-        flattened_structure_ids = [
-            structure_id
-            for structure_id in flattened_structure_ids
-            if structure_id not in entry_id_to_ignore
-        ]
+            if None in entry_structure_ids:
+                entry_id_to_ignore.add(entry_id)
+            else:
+                flattened_structure_ids.extend(entry_structure_ids)
         values_dict_dict = get_values_dict_dict_from_structure_id(
             flattened_structure_ids
         )
@@ -797,19 +952,10 @@ class OQMDTrajectoryTransformer(
                 output_values_dict = values_dict_dict[calculation["output_id"]]
                 output_values_dict["energy"] = calculation["energy"]
 
-                if any(
-                    element in input_values_dict["elements"]
-                    for element in self.exclude_elements
-                ):
-                    cross_compatibility = False
-
                 # Compatibility of the DFT settings
-                # dict from string to dict
-                settings = ast.literal_eval(calculation["settings"])
-                if settings.get("ispin", None) in ["2", 2]:
-                    cross_compatibility = True
-                else:
-                    cross_compatibility = False
+                cross_compatibility = self.exclude_elements.isdisjoint(
+                    input_values_dict["elements"]
+                ) and _is_spin_polarized(calculation["settings"])
 
                 # No need to add the input relaxation step if its an intermediary relaxation number
                 # because it was already the output of the previous relaxation number
@@ -819,7 +965,7 @@ class OQMDTrajectoryTransformer(
                         Trajectory(
                             id=f"{trajectory_immutable_id}-{Functional.PBE.value}-{current_relaxation_number}",
                             source="oqmd",
-                            last_modified=datetime.now().isoformat(),  # not available for OQMD
+                            last_modified=last_modified,  # not available for OQMD
                             relaxation_number=current_relaxation_number,
                             relaxation_step=current_relaxation_step,
                             cross_compatibility=cross_compatibility,
@@ -832,7 +978,7 @@ class OQMDTrajectoryTransformer(
                 current_trajectory = Trajectory(
                     id=f"{trajectory_immutable_id}-{Functional.PBE.value}-{output_relaxation_step}",
                     source="oqmd",
-                    last_modified=datetime.now().isoformat(),  # not available for OQMD
+                    last_modified=last_modified,  # not available for OQMD
                     relaxation_number=current_relaxation_number,
                     relaxation_step=output_relaxation_step,
                     cross_compatibility=cross_compatibility,
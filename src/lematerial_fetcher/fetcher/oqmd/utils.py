@@ -4,20 +4,41 @@ import re
 import tempfile
 from datetime import datetime
 from typing import Optional
+from urllib.parse import urljoin
 
 from lematerial_fetcher.database.mysql import MySQLDatabase, execute_sql_file
-from lematerial_fetcher.utils.io import (
-    download_file,
-    get_page_content,
-    list_download_links_from_page,
-)
+from lematerial_fetcher.utils.io import download_file, get_page_content
 from lematerial_fetcher.utils.logging import logger
 
+# Version of the OQMD dumps in their file names, e.g. v1_0, v1_1
+_VERSION_RE = re.compile(r"v(\d+)_(\d+)")
+# Links to the gzipped SQL dumps, only their URLs are needed so the page is not
+# parsed as HTML
+_SQL_HREF_RE = re.compile(
+    r"""href\s*=\s*["']\s*([^"']+?\.sql\.gz)\s*["']""", re.IGNORECASE
+)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_MONTHS = {
+    "January": 1,
+    "February": 2,
+    "March": 3,
+    "April": 4,
+    "May": 5,
+    "June": 6,
+    "July": 7,
+    "August": 8,
+    "September": 9,
+    "October": 10,
+    "November": 11,
+    "December": 12,
+}
+
 
 def download_and_process_oqmd_sql(
     db_config: dict,
     download_page_url: str = "https://oqmd.org/download/",
     download_dir: str = None,
+    num_connections: int = 8,
 ) -> None:
     """
     Download and process the OQMD SQL database file.
@@ -28,6 +49,8 @@ def download_and_process_oqmd_sql(
         Database configuration with keys: host, user, password, database
     download_dir : str, optional
         Directory for temporary files if needed. If None, uses a temporary directory
+    num_connections : int, optional
+        Number of parallel range requests used to download the dump, by default 8
     """
 
     # Get the latest available version URL and the update date
@@ -60,22 +83,24 @@ def download_and_process_oqmd_sql(
         temp_dir = download_dir or tempfile.mkdtemp()
         os.makedirs(temp_dir, exist_ok=True)
 
-        # Download the gzipped SQL file
+        # Download the gzipped SQL file, it is decompressed while being imported
+        # instead of being written back to disk uncompressed
         logger.info("Downloading SQL database file...")
         sql_gz_path = os.path.join(temp_dir, "oqmd.sql.gz")
         sql_path = os.path.join(temp_dir, "oqmd.sql")
 
-        if not os.path.exists(sql_path):
+        if os.path.exists(sql_path):
+            logger.info("SQL database file already exists. Skipping download.")
+        elif os.path.exists(sql_gz_path):
+            sql_path = sql_gz_path
+            logger.info("SQL database file already exists. Skipping download.")
+        else:
             sql_path = download_file(
                 latest_url,
                 sql_gz_path,
-                "Downloading OQMD database. Progress bar shows uncompressed size so may be misleading.",
-                decompress="gz",
+                "Downloading OQMD database",
+                num_connections=num_connections,
             )
-        else:
-            logger.info("SQL database file already exists. Skipping download.")
-
-        logger.info("File decompressed successfully")
 
         # Create fresh database
         logger.info("Setting up MySQL database")
@@ -91,6 +116,11 @@ def download_and_process_oqmd_sql(
         db.drop_database()
         db.create_database()
 
+        # Merged INSERT statements must fit in the max_allowed_packet of both the
+        # server and the mysql client (16 MB by default), with some margin
+        _, max_allowed_packet = db.fetch_one("SHOW VARIABLES LIKE 'max_allowed_packet'")
+        max_statement_bytes = min(int(max_allowed_packet), 16 * 1024 * 1024) // 2
+
         # Import the SQL file using execute_sql_file
         logger.info("Importing SQL file, this may take a while...")
         try:
@@ -100,6 +130,7 @@ def download_and_process_oqmd_sql(
                 password=db_config["password"],
                 database=db_config["database"],
                 host=db_config["host"],
+                max_statement_bytes=max_statement_bytes,
             )
         except Exception as e:
             logger.error(f"Error during SQL processing: {str(e)}")
@@ -212,6 +243,24 @@ def update_oqmd_version(
     version_db.close()
 
 
+def extract_sql_links(page_content: str, page_url: str) -> list[str]:
+    """Extract the links to gzipped SQL dumps from the HTML of a page.
+
+    Parameters
+    ----------
+    page_content : str
+        The HTML content of the page
+    page_url : str
+        The URL of the page, relative links are resolved against it
+
+    Returns
+    -------
+    list[str]
+        The absolute URLs of the SQL dumps, in the order of the page
+    """
+    return [urljoin(page_url, href) for href in _SQL_HREF_RE.findall(page_content)]
+
+
 def get_latest_sql_file_url_from_oqmd(
     download_page_url: str = "https://oqmd.org/download/",
 ) -> tuple[str, datetime]:
@@ -224,26 +273,21 @@ def get_latest_sql_file_url_from_oqmd(
     """
 
     logger.info(f"Fetching OQMD download page: {download_page_url}")
-    # Look for links containing SQL database files
-    sql_links = list_download_links_from_page(
-        download_page_url,
-        pattern=r"\.sql\.gz\s*$",
-    )
-    sql_links = [link["url"] for link in sql_links]
+    # The page is fetched once, both the links and the update date are read from it
+    page_content = get_page_content(download_page_url)
+    sql_links = extract_sql_links(page_content, download_page_url)
 
     if not sql_links:
         raise ValueError("No SQL database files found on the download page")
 
-    # Sort links by version if possible, otherwise take the first one
     def extract_version(url):
-        match = re.search(r"v(\d+)_(\d+)", url)  # this matches v1_0, v1_1, etc.
+        match = _VERSION_RE.search(url)
         if match:
             return (int(match.group(1)), int(match.group(2)))
         return (0, 0)
 
-    # Sort links by version if possible, otherwise take the first one
-    sql_links.sort(key=extract_version, reverse=True)
-    sql_download_url = sql_links[0]
+    # Take the latest version if possible, otherwise the first link
+    sql_download_url = max(sql_links, key=extract_version)
 
     # Ensure the URL is absolute
     if not sql_download_url.startswith(("http://", "https://")):
@@ -254,11 +298,10 @@ def get_latest_sql_file_url_from_oqmd(
         )
 
     # Extract the version from the URL to find the corresponding date
-    version_match = re.search(r"v(\d+)_(\d+)", sql_download_url)
+    version_match = _VERSION_RE.search(sql_download_url)
     if version_match:
         version = f"v{version_match.group(1)}.{version_match.group(2)}"
         # Extract the date from the page content
-        page_content = get_page_content(download_page_url)
         date_pattern = f"OQMD {version}.*?Database updated on: ([^\\n]+)"
         date_match = re.search(date_pattern, page_content, re.DOTALL)
         if date_match:
@@ -289,23 +332,7 @@ def parse_oqmd_date(date_str: str) -> datetime:
         Parsed datetime object, or today's date if parsing fails
     """
     try:
-        # Convert month name to number
-        month_map = {
-            "January": 1,
-            "February": 2,
-            "March": 3,
-            "April": 4,
-            "May": 5,
-            "June": 6,
-            "July": 7,
-            "August": 8,
-            "September": 9,
-            "October": 10,
-            "November": 11,
-            "December": 12,
-        }
-
-        date_str = re.sub(r"<[^>]+>", "", date_str)  # Remove HTML tags
+        date_str = _HTML_TAG_RE.sub("", date_str)  # Remove HTML tags
         date_str = " ".join(date_str.split())  # Normalize whitespace
 
         # Split the date string and clean it
@@ -314,7 +341,8 @@ def parse_oqmd_date(date_str: str) -> datetime:
         year_str = year_str.strip()
 
         # Convert to datetime
-        return datetime(int(year_str), month_map[month_str], 1)
+        # Convert month name to number
+        return datetime(int(year_str), _MONTHS[month_str], 1)
     except (ValueError, KeyError, AttributeError) as e:
         logger.warning(
             f"Could not parse date string: {date_str}. Error: {str(e)}. Using today's date."
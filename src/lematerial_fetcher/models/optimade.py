@@ -2,15 +2,17 @@
 import datetime
 import math
 import re
+import string
 import warnings
+from functools import lru_cache
 from typing import Optional
 
 import moyopy
 import numpy as np
 from material_hasher.hasher.bawl import BAWLHasher
-from moyopy.interface import MoyoAdapter
 from pydantic import BaseModel, Field, field_validator, model_validator
 from pymatgen.core import Element, Structure
+from pymatgen.core.periodic_table import get_el_sp
 
 from lematerial_fetcher.models.utils.correction import apply_mp_2020_energy_correction
 from lematerial_fetcher.models.utils.enums import Functional, Source
@@ -20,9 +22,63 @@ from lematerial_fetcher.utils.logging import logger
 warnings.filterwarnings("ignore")
 
 SG_MOYOPY_SYMPREC = 1e-4
+# Number of cells whose space group is kept in memory, identical cells come
+# back e.g. as the final frame of a relaxation and its static calculation
+SPACE_GROUP_CACHE_SIZE = 4096
+
+BAWL_HASHER = BAWLHasher()
 
 MAX_FORCE_EV_A = 0.1  # eV/Å
 
+# Anonymous formula: single uppercase letters each followed by an optional number
+_ANONYMOUS_FORMULA_RE = re.compile(r"(?:[A-Z]\d*)+")
+_ANONYMOUS_FORMULA_TOKEN_RE = re.compile(r"[A-Z](\d*)")
+# Element symbols with an explicit count of one, e.g. the O1 of "H2 O1"
+_DESCRIPTIVE_FORMULA_ONE_RE = re.compile(r"([A-Z][a-z]?)1\b")
+_DESCRIPTIVE_FORMULA_RE = re.compile(
+    r"^(?:[A-Z][a-z]?(?:[2-9]\d*|1\d+)?)(?:\s+[A-Z][a-z]?(?:[2-9]\d*|1\d+)?)*$"
+)
+_REDUCED_FORMULA_ONE_RE = re.compile(r"([A-Z][a-z]?)1(?!\d)")
+_REDUCED_FORMULA_RE = re.compile(r"^(?:[A-Z][a-z]?(?:\d+)?)+$")
+
+
+@lru_cache(maxsize=SPACE_GROUP_CACHE_SIZE)
+def _get_space_group_number(
+    basis: bytes, positions: bytes, numbers: tuple[int, ...]
+) -> int:
+    """
+    Get the space group number of a cell with moyopy.
+
+    The cell is given as raw float64 buffers so that identical cells share the
+    same cache entry.
+
+    Parameters
+    ----------
+    basis : bytes
+        The 3x3 lattice matrix, row by row
+    positions : bytes
+        The (nsites, 3) fractional coordinates of the sites
+    numbers : tuple[int, ...]
+        The atomic numbers of the sites
+
+    Returns
+    -------
+    int
+        The international number of the space group
+    """
+    cell = moyopy.Cell(
+        np.frombuffer(basis).reshape(3, 3).tolist(),
+        np.frombuffer(positions).reshape(-1, 3).tolist(),
+        list(numbers),
+    )
+    dataset = moyopy.MoyoDataset(
+        cell=cell,
+        symprec=SG_MOYOPY_SYMPREC,
+        angle_tolerance=None,
+        setting=None,
+    )
+    return dataset.number
+
 
 class OptimadeStructure(BaseModel):
     """
@@ -191,31 +247,34 @@ class OptimadeStructure(BaseModel):
         **kwargs,
     ):
         try:
-            structure = Structure(
-                species=kwargs["species_at_sites"],
-                coords=kwargs["cartesian_site_positions"],
-                lattice=kwargs["lattice_vectors"],
-                coords_are_cartesian=True,
-            )
-
-            # Compute space group with moyopy
+            # Compute space group with moyopy, directly from the cell arrays
             if compute_space_group:
-                cell = MoyoAdapter.from_structure(structure)
-                dataset = moyopy.MoyoDataset(
-                    cell=cell,
-                    symprec=SG_MOYOPY_SYMPREC,
-                    angle_tolerance=None,
-                    setting=None,
+                lattice = np.asarray(kwargs["lattice_vectors"], dtype=np.float64)
+                positions = np.asarray(
+                    kwargs["cartesian_site_positions"], dtype=np.float64
+                )
+                # Cartesian positions are frac_coords @ lattice
+                frac_coords = np.linalg.solve(lattice.T, positions.T).T
+                kwargs["space_group_it_number"] = _get_space_group_number(
+                    lattice.tobytes(),
+                    frac_coords.tobytes(),
+                    # Species may carry an oxidation state, e.g. "Fe2+"
+                    tuple(get_el_sp(s).Z for s in kwargs["species_at_sites"]),
                 )
-                space_group = dataset.number
-                kwargs["space_group_it_number"] = space_group
 
             if compute_bawl_hash:
-                kwargs["bawl_fingerprint"] = BAWLHasher().get_material_hash(structure)
+                structure = Structure(
+                    species=kwargs["species_at_sites"],
+                    coords=kwargs["cartesian_site_positions"],
+                    lattice=kwargs["lattice_vectors"],
+                    coords_are_cartesian=True,
+                )
+                kwargs["bawl_fingerprint"] = BAWL_HASHER.get_material_hash(structure)
 
         except Exception as e:
             logger.warning(
-                f"Failed to create pymatgen structure from {kwargs['immutable_id']}. Error: {e}"
+                "Failed to compute the space group or BAWL hash of "
+                f"{kwargs['immutable_id']}. Error: {e}"
             )
 
         super().__init__(**kwargs)
@@ -240,6 +299,13 @@ class OptimadeStructure(BaseModel):
         try:
             if v is None:
                 return v
+            if isinstance(v, np.ndarray):
+                # A single shape check instead of one per row
+                if v.ndim != 2 or v.shape[1] != 3:
+                    raise ValueError(
+                        f"Expected an array of shape (n, 3), got shape {v.shape}"
+                    )
+                return v.tolist()
             if any(len(row) != 3 for row in v):
                 invalid_rows = [i for i, row in enumerate(v) if len(row) != 3]
                 raise ValueError(
@@ -282,7 +348,7 @@ class OptimadeStructure(BaseModel):
         """
         For many OPTIMADE use cases, the sum of elements_ratios should be ~1.0.
         """
-        ratio_sum = sum(v)
+        ratio_sum = math.fsum(v)
         if not math.isclose(ratio_sum, 1.0, rel_tol=1e-5, abs_tol=1e-8):
             raise ValueError(
                 f"Sum of elements_ratios must be 1.0 (got {ratio_sum:.6f}). "
@@ -296,11 +362,12 @@ class OptimadeStructure(BaseModel):
         """
         Ensure elements are in alphabetical order.
         """
-        if v != sorted(v):
+        sorted_elements = sorted(v)
+        if v != sorted_elements:
             raise ValueError(
                 f"Elements must be in alphabetical order. "
                 f"Current order: {', '.join(v)}, "
-                f"Expected order: {', '.join(sorted(v))}. "
+                f"Expected order: {', '.join(sorted_elements)}. "
                 f"Please reorder the elements list."
             )
         return v
@@ -313,28 +380,25 @@ class OptimadeStructure(BaseModel):
         Example: A2B2C5D12 → A12B5C2D2
         """
         # validate format (single uppercase letter followed by optional number)
-        pattern = r"^[A-Z](?:\d+)?(?:[A-Z](?:\d+)?)*$"
-        if not re.match(pattern, v):
+        if not _ANONYMOUS_FORMULA_RE.fullmatch(v):
             raise ValueError(
                 "Invalid anonymous formula format. "
                 "Formula must consist of capital letters with optional numbers (e.g., A2B3C). "
                 f"Got: '{v}'. Please check for invalid characters or format."
             )
 
-        # extract letter-number pairs
-        pairs = [
-            (m.group(1), int(m.group(2) if m.group(2) else 1))
-            for m in re.finditer(r"([A-Z])(\d+)?", v)
-        ]
-
-        numbers = [x[1] for x in pairs]
-        numbers.sort(reverse=True)
-        pairs = [
-            (chr(64 + i + 1), number) for i, number in enumerate(numbers)
-        ]  # letters in alphabetical order
+        numbers = sorted(
+            (
+                int(number) if number else 1
+                for number in _ANONYMOUS_FORMULA_TOKEN_RE.findall(v)
+            ),
+            reverse=True,
+        )
 
+        # letters in alphabetical order
         return "".join(
-            letter + (str(number) if number > 1 else "") for letter, number in pairs
+            string.ascii_uppercase[i] + (str(number) if number > 1 else "")
+            for i, number in enumerate(numbers)
         )
 
     @field_validator("chemical_formula_descriptive")
@@ -345,12 +409,9 @@ class OptimadeStructure(BaseModel):
         Example: H2 O1 -> H2 O or Ce1 O1 -> Ce O
         """
         # Remove trailing numbers
-        v = re.sub(r"([A-Z][a-z]?)1\b", r"\1", v)
+        v = _DESCRIPTIVE_FORMULA_ONE_RE.sub(r"\1", v)
 
-        pattern = re.compile(
-            r"^(?:[A-Z][a-z]?(?:[2-9]\d*|1\d+)?)(?:\s+[A-Z][a-z]?(?:[2-9]\d*|1\d+)?)*$"
-        )
-        if not pattern.match(v):
+        if not _DESCRIPTIVE_FORMULA_RE.match(v):
             raise ValueError(
                 "Invalid descriptive formula format. "
                 "Formula must consist of element symbols (capital letter + optional lowercase) "
@@ -375,17 +436,15 @@ class OptimadeStructure(BaseModel):
             )
 
         # Check for any "1" in the formula (not just trailing ones)
-        if re.search(r"([A-Z][a-z]?)1(?!\d)", v):
-            matches = re.finditer(r"([A-Z][a-z]?)1(?!\d)", v)
-            problematic_elements = [m.group(1) for m in matches]
+        problematic_elements = _REDUCED_FORMULA_ONE_RE.findall(v)
+        if problematic_elements:
             raise ValueError(
                 f"Chemical formula reduced must not have ones (e.g., {', '.join(problematic_elements)}1). "
                 f"Got: '{v}'. Remove the '1' subscripts or use proper stoichiometric numbers."
             )
 
         # Validate format (element symbols followed by optional numbers)
-        pattern = re.compile(r"^(?:[A-Z][a-z]?(?:\d+)?)+$")
-        if not pattern.match(v):
+        if not _REDUCED_FORMULA_RE.match(v):
             raise ValueError(
                 "Invalid reduced formula format. "
                 "Formula must consist of element symbols followed by optional numbers. "
@@ -458,7 +517,9 @@ class OptimadeStructure(BaseModel):
         """
         if v is None:
             return v
-        max_force = max(np.linalg.norm(force) for force in v)
+        forces = np.asarray(v, dtype=np.float64)
+        # Squared norms of all the forces in one pass, a single square root
+        max_force = float(np.sqrt(np.einsum("ij,ij->i", forces, forces).max()))
         if max_force > MAX_FORCE_EV_A:
             raise ValueError(
                 f"Forces are too high. Maximum allowed force is {MAX_FORCE_EV_A} eV/Å. Got: {max_force}"
@@ -493,11 +554,12 @@ class OptimadeStructure(BaseModel):
                 f"({len(self.chemical_formula_descriptive.split())})"
             )
 
-        # Realign elements and ratios (maintaining alphabetical order)
-        sorted_pairs = sorted(zip(elements, elements_ratios), key=lambda x: x[0])
-        sorted_elements, sorted_ratios = zip(*sorted_pairs)
-        self.elements = list(sorted_elements)
-        self.elements_ratios = list(sorted_ratios)
+        # Realign elements and ratios (maintaining alphabetical order), the
+        # elements are usually already sorted and then left untouched
+        if elements != sorted(elements):
+            order = sorted(range(len(elements)), key=elements.__getitem__)
+            self.elements = [elements[i] for i in order]
+            self.elements_ratios = [elements_ratios[i] for i in order]
 
         # Check nsites consistency
         self.cartesian_site_positions = self._validate_with_number_of_sites(
@@ -523,7 +585,7 @@ class OptimadeStructure(BaseModel):
         )
 
         # Apply the energy correction
-        if self.energy_corrected is None:
+        if self.energy_corrected is None and self.energy is not None:
             self.energy_corrected = apply_mp_2020_energy_correction(
                 structure, self.energy, self.functional, self.source
             )
@@ -14,7 +14,13 @@ from lematerial_fetcher.utils.logging import logger
 MPC = MaterialsProject2020Compatibility()
 
 
-POTCAR_INFO = json.load(open(os.path.join(os.path.dirname(__file__), "potcar.json")))
+def _load_potcar_info() -> dict[str, str]:
+    """Load the element -> POTCAR symbol mapping shipped with the package."""
+    with open(os.path.join(os.path.dirname(__file__), "potcar.json"), "rb") as f:
+        return json.load(f)
+
+
+POTCAR_INFO = _load_potcar_info()
 U_VALUES = {
     "Co": 3.32,
     "Cr": 3.7,
@@ -375,9 +375,11 @@ class Push:
         finally:
             conn.close()
 
-        # No rows exported
-        if len(os.listdir(data_dir)) == 0:
-            return None
+        # No rows exported, stop at the first directory entry instead of
+        # listing every chunk file
+        with os.scandir(data_dir) as entries:
+            if next(entries, None) is None:
+                return None
 
         return self.load_dataset(data_dir)
 
@@ -1,10 +1,14 @@
 # Copyright 2025 Entalpic
+import functools
 import sys
 from abc import ABC, abstractmethod
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from multiprocessing import Manager
-from typing import Any, Generic, Optional, Type, TypeVar
+from multiprocessing import Event
+from multiprocessing.synchronize import Event as EventType
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Generic, Optional, Type, TypeVar
 
 from tqdm import tqdm
 
@@ -23,57 +27,171 @@ TDatabase = TypeVar("TDatabase")
 TStructure = TypeVar("TStructure")
 
 
-def process_batch(
-    worker_id: int,
-    offset: int,
-    limit: int,
-    task_table_name: Optional[str],
+@dataclass
+class WorkerState:
+    """
+    Per-process resources of a transform worker.
+
+    They are set up once by ``init_worker`` and reused by every batch processed
+    in the same worker process, whichever transformer the batch belongs to.
+    """
+
+    config: Optional[TransformerConfig] = None
+    critical_event: Optional[EventType] = None
+    source_db: Optional[Any] = None
+    target_db: Optional[Any] = None
+    transformer: Optional["BaseTransformer"] = None
+
+
+# Mutated in place, so that modules importing it see the current resources
+worker_state = WorkerState()
+
+
+def close_worker() -> None:
+    """Close the database connections of the current worker process."""
+    if worker_state.source_db is not None:
+        worker_state.source_db.close()
+    if worker_state.target_db is not None:
+        worker_state.target_db.close()
+    worker_state.source_db = None
+    worker_state.target_db = None
+    worker_state.transformer = None
+
+
+def init_worker(
     config: TransformerConfig,
+    source_db_factory: Callable[[], Any],
     database_class: Type[TDatabase],
     structure_class: Type[TStructure],
     transformer_class: Type["BaseTransformer[TDatabase, TStructure]"],
-    manager_dict: dict,
+    critical_event: EventType,
 ) -> None:
     """
-    Process a range of rows in a worker process using a server-side cursor.
+    Open the database connections and build the transformer of a worker process.
+
+    This is used as the process pool initializer, so that connections are
+    opened once per worker instead of once per batch, and the static context
+    is sent once to every worker instead of with every batch.
 
     Parameters
     ----------
-    worker_id : int
-        Identifier for the worker
-    offset : int
-        The offset to start fetching rows from
-    limit : int
-        The total number of rows to process (end_offset - start_offset)
-    task_table_name : Optional[str]
-        Task table name to read targets or trajectories from.
-        This is only used for Materials Project.
     config : TransformerConfig
         Configuration object
+    source_db_factory : Callable[[], Any]
+        Picklable callable opening a connection to the source database
     database_class : Type[TDatabase]
         The class to use for the target database
     structure_class : Type[TStructure]
         The class to use for the transformed structures
     transformer_class : Type["BaseTransformer[TDatabase, TStructure]"]
         The transformer class to use for transformation
-    manager_dict : dict
-        Shared dictionary to signal critical errors across processes
+    critical_event : multiprocessing.synchronize.Event
+        Event set to signal critical errors across processes
+    """
+    worker_state.config = config
+    worker_state.critical_event = critical_event
+    worker_state.source_db = source_db_factory()
+    worker_state.target_db = database_class(
+        config.dest_db_conn_str, config.dest_table_name
+    )
+    # The worker only uses transform_row, it never spawns workers of its own
+    worker_state.transformer = transformer_class(
+        config=config,
+        database_class=database_class,
+        structure_class=structure_class,
+        debug=True,
+    )
+    # Forked pool workers exit without running atexit handlers, finalizers
+    # registered with an exit priority are run by multiprocessing instead
+    Finalize(None, close_worker, exitpriority=10)
+
+
+def _insert_structures(target_db: Any, structures: list, batch_size: int) -> None:
     """
+    Insert buffered structures into the target database.
+
+    Parameters
+    ----------
+    target_db : Any
+        Target database connection
+    structures : list
+        Transformed structures to insert
+    batch_size : int
+        Number of rows sent and committed together
+
+    Raises
+    ------
+    Exception
+        If the insert failed, after logging which structures were lost
+    """
+    if not structures:
+        return
     try:
-        # Create new database connections for this process
-        source_db = StructuresDatabase(
-            config.source_db_conn_str, config.source_table_name
+        target_db.batch_insert_data(structures, batch_size=batch_size)
+    except Exception as e:
+        logger.error(
+            f"Error inserting {len(structures)} structures "
+            f"({structures[0].id} -> {structures[-1].id}): {str(e)}"
         )
-        target_db = database_class(config.dest_db_conn_str, config.dest_table_name)
+        raise
+
+
+def process_batch(
+    worker_id: int,
+    offset: int,
+    limit: int,
+    task_table_name: Optional[str],
+) -> int:
+    """
+    Process a range of rows in a worker process using a server-side cursor.
+
+    The configuration, database connections and transformer are those set up
+    by ``init_worker``, which must have been called in the current process.
+
+    Parameters
+    ----------
+    worker_id : int
+        Identifier for the worker
+    offset : int
+        The offset to start fetching rows from
+    limit : int
+        The total number of rows to process (end_offset - start_offset)
+    task_table_name : Optional[str]
+        Task table name to read targets or trajectories from.
+        This is only used for Materials Project.
 
-        # transform the rows into TStructure objects
-        transformer = transformer_class(
-            config=config,
-            database_class=database_class,
-            structure_class=structure_class,
+    Returns
+    -------
+    int
+        The number of rows read from the source table. Fewer rows than `limit`
+        means that the end of the table was reached.
+
+    Raises
+    ------
+    RuntimeError
+        If a critical error occurred in another worker before the batch started
+    Exception
+        If the batch could not be read or inserted, or a row failed with a
+        critical error, so that a failed batch is never mistaken for the end
+        of the table
+    """
+    fetched_count = 0
+    # Batches queued before a critical error in another worker are skipped
+    if worker_state.critical_event.is_set():
+        raise RuntimeError(
+            f"Batch at offset {offset} skipped after a critical error in another worker"
         )
 
+    config = worker_state.config
+    try:
+        source_db = worker_state.source_db
+        target_db = worker_state.target_db
+        transformer = worker_state.transformer
+
         processed_count = 0
+        # Transformed structures are buffered and inserted together, instead of
+        # one round-trip to the target database per source row
+        pending_structures = []
         for raw_structure in (
             pbar := tqdm(
                 source_db.fetch_items_iter(
@@ -93,32 +211,46 @@ def process_batch(
                 miniters=1,
             )
         ):
+            fetched_count += 1
             try:
-                structures = transformer.transform_row(
-                    raw_structure, source_db=source_db, task_table_name=task_table_name
+                pending_structures.extend(
+                    transformer.transform_row(
+                        raw_structure,
+                        source_db=source_db,
+                        task_table_name=task_table_name,
+                    )
                 )
-
-                target_db.batch_insert_data(structures)
-                del structures
-
                 processed_count += 1
                 pbar.update(1)
 
             except Exception as e:
                 logger.warning(f"Error processing {raw_structure.id} row: {str(e)}")
-                # Check if this is a critical error
+                # Critical errors fail the whole batch, other rows are skipped
                 if BaseTransformer.is_critical_error(e):
-                    manager_dict["occurred"] = True  # shared across processes
-                    return
+                    raise
+
+            # Kept out of the per-row handler: a failed insert loses the whole
+            # buffer, so it fails the batch instead of skipping one row
+            if len(pending_structures) >= config.insert_batch_size:
+                structures, pending_structures = pending_structures, []
+                _insert_structures(target_db, structures, config.insert_batch_size)
+                del structures
+
+        _insert_structures(target_db, pending_structures, config.insert_batch_size)
 
     except Exception as e:
-        logger.error(f"Process initialization error: {str(e)}")
+        logger.error(f"Error processing batch at offset {offset}: {str(e)}")
         if BaseTransformer.is_critical_error(e):
-            manager_dict["occurred"] = True  # shared across processes
+            worker_state.critical_event.set()  # shared across processes
+        raise
 
     finally:
-        source_db.close()
-        target_db.close()
+        if worker_state.source_db is not None:
+            # End the read transaction of the server-side cursor so that the
+            # persistent connection does not stay idle in transaction
+            worker_state.source_db.rollback()
+
+    return fetched_count
 
 
 class BaseTransformer(ABC, Generic[TDatabase, TStructure]):
@@ -142,6 +274,11 @@ class BaseTransformer(ABC, Generic[TDatabase, TStructure]):
         Defaults to False.
     """
 
+    # Number of batches queued per worker process, so that a worker finishing a
+    # batch finds the next one already waiting instead of idling until the main
+    # process hands it a new one
+    batches_in_flight_per_worker: int = 2
+
     def __init__(
         self,
         config: Optional[TransformerConfig] = None,
@@ -153,12 +290,6 @@ class BaseTransformer(ABC, Generic[TDatabase, TStructure]):
         self._database_class = database_class
         self._structure_class = structure_class
         self.debug = debug
-        if not debug:
-            self.manager = Manager()
-            self.manager_dict = self.manager.dict()
-            self.manager_dict["occurred"] = False
-        else:
-            self.manager_dict = {}
 
     def setup_databases(self) -> None:
         """Set up source and target database tables."""
@@ -247,9 +378,52 @@ class BaseTransformer(ABC, Generic[TDatabase, TStructure]):
         return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
     def cleanup_resources(self) -> None:
-        """Clean up database connections and process manager."""
-        if hasattr(self, "manager"):
-            self.manager.shutdown()
+        """
+        Clean up any resources that were created during the transform process.
+        Worker connections are closed with the workers, so there is nothing to
+        clean up by default.
+        """
+
+    def _source_db_factory(self) -> Callable[[], Any]:
+        """
+        Get the callable opening a connection to the source database.
+
+        It is sent to the worker processes, so it must be picklable. Subclasses
+        reading from another kind of source database override it.
+
+        Returns
+        -------
+        Callable[[], Any]
+            Callable returning a new source database connection
+        """
+        return functools.partial(
+            StructuresDatabase,
+            self.config.source_db_conn_str,
+            self.config.source_table_name,
+        )
+
+    def _worker_context(self, critical_event: EventType) -> tuple:
+        """
+        Get the arguments of ``init_worker`` for the workers of this transformer.
+
+        Parameters
+        ----------
+        critical_event : multiprocessing.synchronize.Event
+            Event set to signal critical errors across processes
+
+        Returns
+        -------
+        tuple
+            The positional arguments of ``init_worker``
+        """
+        return (
+            self.config,
+            self._source_db_factory(),
+            self._database_class,
+            self._structure_class,
+            self.__class__,
+            critical_event,
+        )
 
     def _process_rows(self) -> None:
         """
@@ -272,140 +446,103 @@ class BaseTransformer(ABC, Generic[TDatabase, TStructure]):
         else:
             max_offset = float("inf")
 
+        # A native event is enough for a single flag, no need to go through a
+        # manager process
+        critical_event = Event()
+        worker_context = self._worker_context(critical_event)
+
         if self.debug:
             # Debug mode: process in main process
-            while True:
-                if offset >= max_offset:
-                    break
+            init_worker(*worker_context)
+            try:
+                while True:
+                    if offset >= max_offset:
+                        break
 
-                # Process batch in main process
-                process_batch(
-                    0,
-                    offset,
-                    batch_size,
-                    task_table_name,
-                    self.config,
-                    self._database_class,
-                    self._structure_class,
-                    self.__class__,
-                    self.manager_dict,
-                )
+                    # Process batch in main process
+                    fetched_count = process_batch(
+                        0, offset, batch_size, task_table_name
+                    )
 
-                # Check if we should continue
-                source_db = StructuresDatabase(
-                    self.config.source_db_conn_str, self.config.source_table_name
-                )
-                rows = source_db.fetch_items(offset=offset + batch_size, batch_size=1)
-                source_db.close()
-                if not rows:
-                    break
+                    total_processed += fetched_count
+                    logger.info(f"Total processed: {total_processed}")
 
-                total_processed += batch_size
-                logger.info(f"Total processed: {total_processed}")
-                offset += batch_size
+                    # A batch shorter than requested means the end of the table
+                    # was reached, no need to probe for more rows
+                    if fetched_count < batch_size:
+                        break
+                    offset += batch_size
+            finally:
+                close_worker()
 
             logger.info(f"Completed processing {total_processed} total rows")
             return
 
         # Normal mode: process in parallel with work stealing
-        with ProcessPoolExecutor(max_workers=self.config.num_workers) as executor:
-            futures = set()
+        with ProcessPoolExecutor(
+            max_workers=self.config.num_workers,
+            initializer=init_worker,
+            initargs=worker_context,
+        ) as executor:
+            process_func = functools.partial(
+                process_batch, limit=batch_size, task_table_name=task_table_name
+            )
+            # In-flight batches, keyed by future to find them back in O(1)
+            pending: dict[Future, tuple[int, int]] = {}
 
             # Submit initial batch of tasks
-            for i in range(self.config.num_workers):
+            initial_batches = (
+                self.batches_in_flight_per_worker * self.config.num_workers
+            )
+            for i in range(initial_batches):
                 if offset + (i * batch_size) >= max_offset:
                     break
 
-                future = executor.submit(
-                    process_batch,
-                    i,
-                    offset + (i * batch_size),
-                    batch_size,
-                    task_table_name,
-                    self.config,
-                    self._database_class,
-                    self._structure_class,
-                    self.__class__,
-                    self.manager_dict,
-                )
-                futures.add((i, offset + (i * batch_size), future))
+                future = executor.submit(process_func, i, offset + (i * batch_size))
+                pending[future] = (i, offset + (i * batch_size))
                 total_processed += batch_size
 
-            offset += batch_size * self.config.num_workers
+            offset += batch_size * initial_batches
             more_data = True
 
-            while futures and more_data:
-                # Check for completed futures and remove them
-                done_futures = set()
-                for worker_id, current_offset, future in futures:
-                    if future.done():
-                        try:
-                            future.result()
-
-                            if self.manager_dict.get("occurred", False):
-                                logger.critical(
-                                    "Critical error detected, shutting down process pool"
-                                )
-                                executor.shutdown(wait=False)
-                                raise RuntimeError(
-                                    "Critical error occurred during processing"
-                                )
-
-                            # Check if there might be more data
-                            source_db = StructuresDatabase(
-                                self.config.source_db_conn_str,
-                                self.config.source_table_name,
-                            )
-                            check_rows = source_db.fetch_items(
-                                offset=offset, batch_size=1
-                            )
-                            source_db.close()
-
-                            if check_rows:
-                                if offset >= max_offset:
-                                    more_data = False
-
-                                # Submit new task
-                                next_future = executor.submit(
-                                    process_batch,
-                                    worker_id,
-                                    offset,
-                                    batch_size,
-                                    task_table_name,
-                                    self.config,
-                                    self._database_class,
-                                    self._structure_class,
-                                    self.__class__,
-                                    self.manager_dict,
-                                )
-                                futures.add((worker_id, offset, next_future))
-                                offset += batch_size
-                            else:
-                                more_data = False
-
-                            logger.info(
-                                f"Successfully processed batch at offsets {current_offset} -> {current_offset + batch_size}"
+            # Batches already in flight when the end of the table is reached go
+            # through the same failure handling as the others
+            while pending:
+                # Block until at least one batch is done instead of polling
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    worker_id, current_offset = pending.pop(future)
+                    try:
+                        fetched_count = future.result()
+                        if critical_event.is_set():
+                            raise RuntimeError(
+                                "Critical error occurred during processing"
                             )
-
-                        except Exception as e:
-                            logger.error(f"Critical error encountered: {str(e)}")
-                            executor.shutdown(wait=False)
-                            raise
-
-                        done_futures.add((worker_id, current_offset, future))
-                        break
-
-                futures -= done_futures
-
-            # Wait for remaining futures
-            for worker_id, current_offset, future in futures:
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(
-                        f"Error processing batch at offset {current_offset}: {str(e)}"
+                    except Exception as e:
+                        # Single shutdown path, queued batches are cancelled
+                        # instead of being started by the workers
+                        logger.critical(
+                            f"Critical error encountered, shutting down process pool: {str(e)}"
+                        )
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+
+                    logger.info(
+                        f"Successfully processed batch at offsets {current_offset} -> {current_offset + batch_size}"
                     )
 
+                    # A batch shorter than requested means the end of the table
+                    # was reached, so there is no need to probe the source
+                    # database for more rows. Failed batches raise above, so a
+                    # short count here always comes from a complete read
+                    has_more_rows = fetched_count == batch_size and offset < max_offset
+                    if more_data and has_more_rows:
+                        next_future = executor.submit(process_func, worker_id, offset)
+                        pending[next_future] = (worker_id, offset)
+                        offset += batch_size
+                    else:
+                        more_data = False
+
             logger.info(
                 f"Completed processing approximately {total_processed} total rows"
             )
@@ -160,6 +160,13 @@ def add_transformer_options(f):
             envvar="LEMATERIALFETCHER_DB_FETCH_BATCH_SIZE",
             help="Batch size to fetch data from the database. Use a smaller batch size to avoid memory issues.",
         ),
+        click.option(
+            "--insert-batch-size",
+            type=int,
+            default=10000,
+            envvar="LEMATERIALFETCHER_INSERT_BATCH_SIZE",
+            help="Number of rows sent in a single multi-row INSERT statement, and committed together, to the destination database.",
+        ),
         click.option(
             "--offset",
             type=int,
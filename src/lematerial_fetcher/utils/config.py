@@ -43,6 +43,7 @@ class TransformerConfig(BaseConfig):
     db_fetch_batch_size: Optional[int] = None
     mp_task_table_name: Optional[str] = None
     mysql_config: Optional[dict] = None
+    insert_batch_size: int = 10000
 
 
 @dataclass
@@ -239,6 +240,7 @@ def load_transformer_config(
     # Other params
     batch_size: int = 500,
     db_fetch_batch_size: Optional[int] = None,
+    insert_batch_size: int = 10000,
     max_offset: Optional[int] = None,
     task_source_table_name: Optional[str] = None,
     mysql_host: str = "localhost",
@@ -302,6 +304,7 @@ def load_transformer_config(
         "dest_table_name": dest_table_name,
         "batch_size": batch_size,
         "db_fetch_batch_size": db_fetch_batch_size,
+        "insert_batch_size": insert_batch_size,
         "max_offset": max_offset,
         "mp_task_table_name": task_source_table_name,
     }
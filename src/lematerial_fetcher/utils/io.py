@@ -1,9 +1,13 @@
 # Copyright 2025 Entalpic
 import bz2
 import gzip
+import io
 import os
 import re
+import shutil
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Optional
 from urllib.parse import urljoin, urlparse
@@ -16,6 +20,10 @@ from urllib3.util.retry import Retry
 
 from lematerial_fetcher.utils.logging import logger
 
+# Buffer size for local file copies, large enough to keep the number of
+# syscalls low on multi-GB files.
+COPY_BUFFER_SIZE = 1 << 20
+
 
 def create_session() -> requests.Session:
     """Create a session with retry capability."""
@@ -31,12 +39,258 @@ def create_session() -> requests.Session:
     return session
 
 
+def strip_compression_suffix(path: str, decompress: Optional[str]) -> str:
+    """
+    Get the path of the decompressed version of a file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the compressed file.
+    decompress : Optional[str]
+        The type of compression, e.g. "gz" or "bz2". If None, the path is returned as is.
+
+    Returns
+    -------
+    str
+        The path without its compression suffix.
+    """
+    suffix = f".{decompress}"
+    if decompress and path.endswith(suffix):
+        return path[: -len(suffix)]
+    return path
+
+
+def get_range_download_size(session: requests.Session, url: str) -> int:
+    """
+    Get the size of a remote file if it can be downloaded by byte ranges.
+
+    Parameters
+    ----------
+    session : requests.Session
+        The session to send the HEAD request with.
+    url : str
+        The URL of the file.
+
+    Returns
+    -------
+    int
+        The size of the file in bytes, or 0 if the server does not advertise
+        range support or the size is unknown.
+    """
+    response = session.head(url, allow_redirects=True)
+    if not response.ok:
+        return 0
+    if response.headers.get("accept-ranges", "").lower() != "bytes":
+        return 0
+    return int(response.headers.get("content-length", 0))
+
+
+def _download_range(
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    pbar: tqdm,
+    pbar_lock: threading.Lock,
+    stop: threading.Event,
+    block_size: int = 1 << 20,
+) -> None:
+    """
+    Download the bytes ``start`` to ``end`` (inclusive) of a file at their offset in ``fd``.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the file.
+    fd : int
+        The file descriptor to write to, preallocated to the full size.
+    start : int
+        The first byte of the range.
+    end : int
+        The last byte of the range.
+    pbar : tqdm
+        The progress bar shared by all ranges.
+    pbar_lock : threading.Lock
+        The lock protecting the progress bar.
+    stop : threading.Event
+        Set when another range failed, the download is then abandoned.
+    block_size : int
+        The size of the chunks read from the response.
+    """
+    session = create_session()
+    try:
+        response = session.get(
+            url, headers={"Range": f"bytes={start}-{end}"}, stream=True
+        )
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(f"Server ignored the range request for {url}")
+
+        offset = start
+        for chunk in response.iter_content(block_size):
+            if stop.is_set():
+                return
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+            with pbar_lock:
+                pbar.update(len(chunk))
+
+        if offset != end + 1:
+            raise IOError(
+                f"Incomplete range {start}-{end} for {url}: got {offset - start} bytes"
+            )
+    finally:
+        session.close()
+
+
+def download_file_in_ranges(
+    url: str,
+    path: str,
+    total_size: int,
+    num_connections: int = 8,
+    desc: Optional[str] = None,
+    position: int = 0,
+) -> str:
+    """
+    Download a file with several parallel HTTP range requests.
+
+    The file is preallocated and each connection writes its own slice at its
+    offset, which makes better use of the bandwidth than a single connection
+    on large files.
+
+    Parameters
+    ----------
+    url : str
+        The URL to download the file from.
+    path : str
+        The path to save the file to.
+    total_size : int
+        The size of the file in bytes, see ``get_range_download_size``.
+    num_connections : int
+        The number of parallel connections.
+    desc : Optional[str]
+        The description to display in the progress bar.
+    position : int
+        The position of the progress bar.
+
+    Returns
+    -------
+    str
+        The path to the downloaded file.
+    """
+    range_size = -(-total_size // num_connections)  # ceil division
+    ranges = [
+        (start, min(start + range_size, total_size) - 1)
+        for start in range(0, total_size, range_size)
+    ]
+    pbar_lock = threading.Lock()
+    stop = threading.Event()
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.truncate(total_size)
+            with (
+                tqdm(
+                    total=total_size,
+                    unit="iB",
+                    unit_scale=True,
+                    desc=desc,
+                    position=position,
+                    leave=False,
+                    miniters=1024 * 1024,
+                ) as pbar,
+                ThreadPoolExecutor(max_workers=num_connections) as executor,
+            ):
+                futures = [
+                    executor.submit(
+                        _download_range,
+                        url,
+                        f.fileno(),
+                        start,
+                        end,
+                        pbar,
+                        pbar_lock,
+                        stop,
+                    )
+                    for start, end in ranges
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    # The other ranges stop at their next chunk instead of
+                    # downloading data that will be thrown away
+                    stop.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, path)
+    return path
+
+
+def decompress_file(path: str, decompress: str) -> str:
+    """
+    Decompress a gzip or bz2 file next to the compressed one and remove the latter.
+
+    Parameters
+    ----------
+    path : str
+        The path to the compressed file.
+    decompress : str
+        The type of compression. Supported types are "gz" and "bz2".
+
+    Returns
+    -------
+    str
+        The path to the decompressed file.
+    """
+    if decompress == "gz":
+        opener = gzip.open
+    elif decompress == "bz2":
+        opener = bz2.open
+    else:
+        raise ValueError(f"Unsupported compression type: {decompress}")
+
+    output_path = strip_compression_suffix(path, decompress)
+    if output_path == path:
+        raise ValueError(f"{path} does not end with .{decompress}")
+
+    # The output is only ever created by the atomic rename below, so if it
+    # exists it is complete and a re-run can skip the decompression
+    if os.path.exists(output_path):
+        logger.info(f"{output_path} already exists. Skipping decompression.")
+    else:
+        tmp_path = f"{output_path}.tmp"
+        try:
+            with (
+                opener(path, "rb") as f_in,
+                open(tmp_path, "wb", buffering=COPY_BUFFER_SIZE) as f_out,
+            ):
+                shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    return output_path
+
+
 def download_file(
     url: str,
     path: Optional[str] = None,
     desc: Optional[str] = None,
     decompress: str = None,
     position: int = 0,
+    num_connections: int = 1,
 ) -> str:
     """
     Download a file from a URL and save it to a local path. Optionally decompress gzipped content on the fly.
@@ -54,6 +308,10 @@ def download_file(
         Supported types are "gz" and "bz2".
     position : int
         The position of the worker in the pool. Used to have different tqdm progress bars for different workers.
+    num_connections : int
+        The number of parallel range requests to use. If greater than 1 and the server
+        supports range requests, the compressed file is downloaded in parallel and
+        decompressed afterwards instead of on the fly.
 
     Returns
     -------
@@ -68,18 +326,72 @@ def download_file(
 
     session = create_session()
 
+    if num_connections > 1:
+        total_size = get_range_download_size(session, url)
+        if total_size:
+            download_file_in_ranges(
+                url, path, total_size, num_connections, desc, position
+            )
+            if decompress:
+                path = decompress_file(path, decompress)
+            return path
+        logger.info(
+            f"{url} does not support range requests, downloading with a single connection"
+        )
+
     response = session.get(url, stream=True)
     response.raise_for_status()
 
     total_size = int(response.headers.get("content-length", 0))
-    block_size = 8192
+    block_size = COPY_BUFFER_SIZE
 
-    if decompress == "gz":
-        path = path.replace(".gz", "")
-    elif decompress == "bz2":
-        path = path.replace(".bz2", "")
+    path = strip_compression_suffix(path, decompress)
 
-    with open(path, "wb") as f:
+    # Write to a temporary file and rename it once complete, so that an
+    # interrupted download never leaves a truncated file at the final path
+    tmp_path = f"{path}.tmp"
+    try:
+        _stream_response_to_file(
+            response, tmp_path, total_size, block_size, decompress, desc, position
+        )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path
+
+
+def _stream_response_to_file(
+    response: requests.Response,
+    path: str,
+    total_size: int,
+    block_size: int,
+    decompress: Optional[str],
+    desc: Optional[str],
+    position: int,
+) -> None:
+    """
+    Write a streamed response to a file, optionally decompressing it on the fly.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The streamed response.
+    path : str
+        The path to write to.
+    total_size : int
+        The size announced by the server, used for the progress bar.
+    block_size : int
+        The size of the chunks read from the response.
+    decompress : Optional[str]
+        The type of compression to decompress, "gz", "bz2" or None.
+    desc : Optional[str]
+        The description to display in the progress bar.
+    position : int
+        The position of the progress bar.
+    """
+    with open(path, "wb", buffering=COPY_BUFFER_SIZE) as f:
         with tqdm(
             total=total_size,
             unit="iB",
@@ -90,7 +402,12 @@ def download_file(
             miniters=1024 * 1024,
         ) as pbar:
             if decompress == "gz":
-                decompressor = gzip.GzipFile(fileobj=response.raw, mode="rb")
+                # gzip reads its input in small slices, the buffer turns them
+                # into large reads from the socket
+                decompressor = gzip.GzipFile(
+                    fileobj=io.BufferedReader(response.raw, buffer_size=block_size),
+                    mode="rb",
+                )
                 while True:
                     chunk = decompressor.read(block_size)
                     if not chunk:
@@ -112,8 +429,6 @@ def download_file(
                     size = f.write(data)
                     pbar.update(size)
 
-    return path
-
 
 def list_download_links_from_page(
     url: str, pattern: str = None
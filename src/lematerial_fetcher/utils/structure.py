@@ -1,3 +1,6 @@
+from collections import Counter
+from functools import lru_cache
+
 import numpy as np
 from pymatgen.core import Composition, Structure
 
@@ -5,11 +8,10 @@ from pymatgen.core import Composition, Structure
 def get_element_ratios_from_composition_reduced(
     composition_reduced: dict[str, float],
 ) -> list[float]:
-    elements = list(composition_reduced.keys())
-    ratios = list(composition_reduced.values())
-    ratios = [int(ratio) for ratio in ratios]
+    ratios = {element: int(ratio) for element, ratio in composition_reduced.items()}
+    total = sum(ratios.values())
 
-    element_ratios = [ratios[i] / sum(ratios) for i in np.argsort(elements)]
+    element_ratios = [ratios[element] / total for element in sorted(ratios)]
     return element_ratios
 
 
@@ -36,37 +38,36 @@ def get_composition_reduced_from_descriptive_formula(batch):
     return batch
 
 
-def get_optimade_from_pymatgen(structure: Structure) -> dict:
+def get_optimade_composition_fields(composition: Composition) -> dict:
     """
-    Extracts the possible fields from a pymatgen Structure object
-    that are compatible with the OPTIMADE schema.
+    Extracts the OPTIMADE fields that only depend on the composition.
+
+    This avoids building a full pymatgen Structure when the caller already
+    has the site coordinates and only needs the chemistry fields.
 
     Parameters
     ----------
-    structure : Structure
-        A pymatgen Structure object
+    composition : Composition
+        A pymatgen Composition object, with one unit per site
 
     Returns
     -------
     dict
-        An OPTIMADE-compliant dictionary containing partial structure data
-        necessary to create an OptimadeStructure object.
+        A dictionary containing the elements, ratios, formulas and species
+        fields of an OptimadeStructure.
     """
     # Basic chemistry fields
-    elements = sorted(list(set(str(site.specie) for site in structure.sites)))
+    elements = sorted(str(element) for element in composition.elements)
     # Note that this function returns a different result than the composition.to_reduced_dict method of pymatgen
-    reduced_dict = structure.composition.to_reduced_dict
+    reduced_dict = composition.to_reduced_dict
     elements_ratios = get_element_ratios_from_composition_reduced(reduced_dict)
 
     # Formula fields
     chemical_formula_reduced = get_composition_reduced_from_reduced_dict(reduced_dict)
-    chemical_formula_anonymous = structure.composition.anonymized_formula
+    chemical_formula_anonymous = composition.anonymized_formula
     # TODO(Ramlaoui): Maybe we should use the factor here?
-    chemical_formula_descriptive = structure.composition.formula
+    chemical_formula_descriptive = composition.formula
 
-    # Site and position data
-    cartesian_site_positions = structure.cart_coords.tolist()
-    species_at_sites = [str(site.specie) for site in structure.sites]
     species = [
         {
             "mass": None,
@@ -80,9 +81,74 @@ def get_optimade_from_pymatgen(structure: Structure) -> dict:
         for element in elements
     ]
 
+    return {
+        "elements": elements,
+        "nelements": len(elements),
+        "elements_ratios": elements_ratios,
+        "species": species,
+        "chemical_formula_anonymous": chemical_formula_anonymous,
+        "chemical_formula_descriptive": chemical_formula_descriptive,
+        "chemical_formula_reduced": chemical_formula_reduced,
+    }
+
+
+@lru_cache(maxsize=4096)
+def _get_optimade_composition_fields_cached(
+    species_counts: tuple[tuple[str, int], ...],
+) -> dict:
+    """Cached `get_optimade_composition_fields`, keyed by (element, count) pairs."""
+    return get_optimade_composition_fields(Composition(dict(species_counts)))
+
+
+def get_optimade_composition_fields_from_sites(species_at_sites: list[str]) -> dict:
+    """
+    Extracts the OPTIMADE fields that only depend on the composition from the
+    species of the sites of a structure.
+
+    The same compositions come back many times in a source (calculations of the
+    same material, steps of a trajectory), so the fields are cached by the
+    number of sites of every element.
+
+    Parameters
+    ----------
+    species_at_sites : list[str]
+        The element symbol of every site
+
+    Returns
+    -------
+    dict
+        The same dictionary as `get_optimade_composition_fields`. The values
+        are shared between calls and must not be modified in place.
+    """
+    species_counts = tuple(sorted(Counter(species_at_sites).items()))
+    return dict(_get_optimade_composition_fields_cached(species_counts))
+
+
+def get_optimade_from_pymatgen(structure: Structure) -> dict:
+    """
+    Extracts the possible fields from a pymatgen Structure object
+    that are compatible with the OPTIMADE schema.
+
+    Parameters
+    ----------
+    structure : Structure
+        A pymatgen Structure object
+
+    Returns
+    -------
+    dict
+        An OPTIMADE-compliant dictionary containing partial structure data
+        necessary to create an OptimadeStructure object.
+    """
+    # Structure.composition is rebuilt on every access, so compute it once
+    composition_fields = get_optimade_composition_fields(structure.composition)
+
+    # Site and position data
+    cartesian_site_positions = structure.cart_coords.tolist()
+    species_at_sites = [str(site.specie) for site in structure.sites]
+
     # Structure metadata
-    nsites = len(structure.sites)
-    nelements = len(elements)
+    nsites = len(species_at_sites)
 
     # Lattice and dimensionality
     lattice_vectors = structure.lattice.matrix.tolist()
@@ -91,22 +157,56 @@ def get_optimade_from_pymatgen(structure: Structure) -> dict:
 
     return {
         # Required fields
-        "elements": elements,
-        "nelements": nelements,
-        "elements_ratios": elements_ratios,
+        **composition_fields,
         "nsites": nsites,
         "cartesian_site_positions": cartesian_site_positions,
         "species_at_sites": species_at_sites,
-        "species": species,
-        "chemical_formula_anonymous": chemical_formula_anonymous,
-        "chemical_formula_descriptive": chemical_formula_descriptive,
-        "chemical_formula_reduced": chemical_formula_reduced,
         "dimension_types": dimension_types,
         "nperiodic_dimensions": nperiodic_dimensions,
         "lattice_vectors": lattice_vectors,
     }
 
 
+def get_optimade_from_sites(
+    species_at_sites: list[str],
+    frac_coords: np.ndarray | list[list[float]],
+    lattice_vectors: np.ndarray | list[list[float]],
+) -> dict:
+    """
+    Extracts the same fields as `get_optimade_from_pymatgen` directly from the
+    sites of a periodic 3D structure, without building a pymatgen Structure.
+
+    Parameters
+    ----------
+    species_at_sites : list[str]
+        The element symbol of every site
+    frac_coords : np.ndarray | list[list[float]]
+        The fractional coordinates of the sites, of shape (nsites, 3)
+    lattice_vectors : np.ndarray | list[list[float]]
+        The lattice vectors, as rows of a 3x3 matrix
+
+    Returns
+    -------
+    dict
+        An OPTIMADE-compliant dictionary containing partial structure data
+        necessary to create an OptimadeStructure object.
+    """
+    lattice_vectors = np.asarray(lattice_vectors, dtype=np.float64)
+    cartesian_site_positions = np.dot(
+        np.asarray(frac_coords, dtype=np.float64).reshape(-1, 3), lattice_vectors
+    )
+
+    return {
+        **get_optimade_composition_fields_from_sites(species_at_sites),
+        "nsites": len(species_at_sites),
+        "cartesian_site_positions": cartesian_site_positions.tolist(),
+        "species_at_sites": list(species_at_sites),
+        "dimension_types": [1, 1, 1],
+        "nperiodic_dimensions": 3,
+        "lattice_vectors": lattice_vectors.tolist(),
+    }
+
+
 def stress_matrix_from_voigt_6_stress(voigt_6_stress: list[float]) -> list[float]:
     """
     Convert a 6-element voigt notation stress tensor to a full 3x3 stress matrix.
@@ -0,0 +1,87 @@
+# Copyright 2025 Entalpic
+from lematerial_fetcher.database.mysql import coalesce_inserts, defer_secondary_keys
+
+
+def test_coalesce_inserts_merges_consecutive_inserts():
+    """Test consecutive INSERTs into the same table are merged."""
+    lines = [
+        b"LOCK TABLES `atoms` WRITE;\n",
+        b"INSERT INTO `atoms` VALUES (1,'Fe');\n",
+        b"INSERT INTO `atoms` VALUES (2,'O;'),(3,'O');\n",
+        b"INSERT INTO `entries` VALUES (1);\n",
+        b"UNLOCK TABLES;\n",
+    ]
+
+    assert list(coalesce_inserts(lines)) == [
+        b"LOCK TABLES `atoms` WRITE;\n",
+        b"INSERT INTO `atoms` VALUES (1,'Fe'),(2,'O;'),(3,'O');\n",
+        b"INSERT INTO `entries` VALUES (1);\n",
+        b"UNLOCK TABLES;\n",
+    ]
+
+
+def test_coalesce_inserts_limits_statement_size():
+    """Test merged statements are split once they reach the maximum size."""
+    lines = [b"INSERT INTO `t` VALUES (%d);\n" % i for i in range(30)]
+
+    merged = list(coalesce_inserts(lines, max_statement_bytes=60))
+
+    assert len(merged) > 1
+    assert all(len(statement) <= 60 for statement in merged)
+    assert b"".join(merged).count(b"(") == 30
+
+
+def test_defer_secondary_keys():
+    """Test secondary keys are removed from the tables and added back after."""
+    lines = [
+        b"DROP TABLE IF EXISTS `atoms`;\n",
+        b"CREATE TABLE `atoms` (\n",
+        b"  `id` int NOT NULL,\n",
+        b"  `element_id` varchar(3) NOT NULL,\n",
+        b"  PRIMARY KEY (`id`),\n",
+        b"  KEY `atoms_element_id` (`element_id`),\n",
+        b"  CONSTRAINT `fk_element` FOREIGN KEY (`element_id`) "
+        b"REFERENCES `elements` (`symbol`)\n",
+        b") ENGINE=InnoDB;\n",
+        b"INSERT INTO `atoms` VALUES (1,'Fe');\n",
+    ]
+    deferred = []
+
+    assert list(defer_secondary_keys(lines, deferred)) == [
+        b"DROP TABLE IF EXISTS `atoms`;\n",
+        b"CREATE TABLE `atoms` (\n",
+        b"  `id` int NOT NULL,\n"
+        b"  `element_id` varchar(3) NOT NULL,\n"
+        b"  PRIMARY KEY (`id`)\n",
+        b") ENGINE=InnoDB;\n",
+        b"INSERT INTO `atoms` VALUES (1,'Fe');\n",
+    ]
+    assert deferred == [
+        b"ALTER TABLE `atoms` ADD KEY `atoms_element_id` (`element_id`);\n",
+        b"ALTER TABLE `atoms` ADD CONSTRAINT `fk_element` FOREIGN KEY "
+        b"(`element_id`) REFERENCES `elements` (`symbol`);\n",
+    ]
+
+
+def test_defer_secondary_keys_keeps_auto_increment_key():
+    """Test the only key on an AUTO_INCREMENT column stays in the table."""
+    lines = [
+        b"CREATE TABLE `entries` (\n",
+        b"  `name` varchar(20) NOT NULL,\n",
+        b"  `id` int NOT NULL AUTO_INCREMENT,\n",
+        b"  PRIMARY KEY (`name`),\n",
+        b"  UNIQUE KEY `id` (`id`),\n",
+        b"  KEY `entries_id` (`id`)\n",
+        b") ENGINE=InnoDB AUTO_INCREMENT=3;\n",
+    ]
+    deferred = []
+
+    assert list(defer_secondary_keys(lines, deferred)) == [
+        b"CREATE TABLE `entries` (\n",
+        b"  `name` varchar(20) NOT NULL,\n"
+        b"  `id` int NOT NULL AUTO_INCREMENT,\n"
+        b"  PRIMARY KEY (`name`),\n"
+        b"  UNIQUE KEY `id` (`id`)\n",
+        b") ENGINE=InnoDB AUTO_INCREMENT=3;\n",
+    ]
+    assert deferred == [b"ALTER TABLE `entries` ADD KEY `entries_id` (`id`);\n"]
@@ -1 +1,54 @@
 # Copyright 2025 Entalpic
+from datetime import datetime, timezone
+
+from lematerial_fetcher.fetcher.alexandria.fetch import _max_modified, read_item
+
+
+def test_read_item_parses_zulu_timestamp():
+    """Test the last modified date is parsed and truncated to the day"""
+    item = {
+        "id": "agm002153973",
+        "type": "structures",
+        "attributes": {"last_modified": "2024-03-14T10:20:30Z"},
+    }
+
+    structure, latest_modified = read_item(item, None)
+
+    assert structure.last_modified == "2024-03-14"
+    assert latest_modified == datetime(2024, 3, 14, 10, 20, 30, tzinfo=timezone.utc)
+
+
+def test_read_item_keeps_latest_modified():
+    """Test an older item does not replace the latest modified date"""
+    latest = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    item = {
+        "id": "agm002153973",
+        "type": "structures",
+        "attributes": {"last_modified": "2024-03-14T10:20:30Z"},
+    }
+
+    _, latest_modified = read_item(item, latest)
+
+    assert latest_modified == latest
+
+
+def test_read_item_without_last_modified():
+    """Test items without a last modified date are still converted"""
+    item = {"id": "agm002153973", "type": "structures", "attributes": {}}
+
+    structure, latest_modified = read_item(item, None)
+
+    assert structure.last_modified is None
+    assert latest_modified is None
+
+
+def test_max_modified_ignores_missing_dates():
+    """Test the latest date is kept whichever side is missing or older"""
+    older = datetime(2024, 3, 14, tzinfo=timezone.utc)
+    newer = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert _max_modified(None, older) == older
+    assert _max_modified(newer, None) == newer
+    assert _max_modified(newer, older) == newer
+    assert _max_modified(older, newer) == newer
+    assert _max_modified(None, None) is None
@@ -0,0 +1,19 @@
+# Copyright 2025 Entalpic
+import pytest
+
+from lematerial_fetcher.fetcher.oqmd.transform import _is_spin_polarized
+
+
+@pytest.mark.parametrize(
+    "settings, expected",
+    [
+        ("{'encut': 520, 'ispin': 2, 'nelm': 60}", True),
+        ("{'ispin': '2'}", True),
+        ("{'ispin': 1, 'nelm': 60}", False),
+        ("{'ispin': 20}", False),
+        ("{'encut': 520}", False),
+    ],
+)
+def test_is_spin_polarized(settings, expected):
+    """Test the ispin entry is read from the serialized settings"""
+    assert _is_spin_polarized(settings) is expected
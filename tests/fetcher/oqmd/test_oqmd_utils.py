@@ -0,0 +1,23 @@
+# Copyright 2025 Entalpic
+from datetime import datetime
+
+from lematerial_fetcher.fetcher.oqmd.utils import extract_sql_links, parse_oqmd_date
+
+
+def test_parse_oqmd_date_strips_html():
+    """Test the month and year are read from a date wrapped in HTML tags."""
+    assert parse_oqmd_date("<b>November,</b>\n  2023") == datetime(2023, 11, 1)
+
+
+def test_extract_sql_links():
+    """Test only the SQL dump links are extracted, as absolute URLs."""
+    page_content = (
+        '<a href="/static/downloads/qmdb__v1_6.sql.gz">v1.6</a>'
+        '<a href="/static/downloads/README.txt">readme</a>'
+        "<A HREF='https://oqmd.org/qmdb__v1_5.sql.gz '>v1.5</A>"
+    )
+
+    assert extract_sql_links(page_content, "https://oqmd.org/download/") == [
+        "https://oqmd.org/static/downloads/qmdb__v1_6.sql.gz",
+        "https://oqmd.org/qmdb__v1_5.sql.gz",
+    ]
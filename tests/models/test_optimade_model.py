@@ -1,6 +1,7 @@
 # Copyright 2025 Entalpic
 import datetime
 
+import numpy as np
 import pytest
 
 from lematerial_fetcher.models.optimade import Functional, OptimadeStructure
@@ -102,6 +103,19 @@ def test_invalid_positions():
         OptimadeStructure(**data)
 
 
+def test_numpy_site_vectors():
+    """Test (nsites, 3) numpy arrays are accepted and checked by their shape."""
+    data = VALID_STRUCTURE_DATA.copy()
+    data["cartesian_site_positions"] = np.array([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]])
+    data["forces"] = np.zeros((2, 3))
+    structure = OptimadeStructure(**data)
+    assert structure.cartesian_site_positions == [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
+
+    data["forces"] = np.zeros((2, 2))
+    with pytest.raises(ValueError):
+        OptimadeStructure(**data)
+
+
 def test_inconsistent_site_counts():
     """Test validation of site count consistency."""
     data = VALID_STRUCTURE_DATA.copy()
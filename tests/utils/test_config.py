@@ -724,3 +724,24 @@ def test_load_push_config_missing_required():
     assert "db credentials" in str(excinfo.value)
     assert "table_name" in str(excinfo.value)
     assert "hf_repo_id" in str(excinfo.value)
+
+
+def test_load_transformer_config_insert_sizes():
+    """Test the insert sizes are independent from the read batch size"""
+    os.environ["LEMATERIALFETCHER_DB_PASSWORD"] = "source_pass"
+
+    config_kwargs = {
+        "db_user": "source_user",
+        "db_name": "source_db",
+        "table_name": "source_table",
+        "dest_table_name": "dest_table",
+        "batch_size": 100,
+    }
+
+    config = load_transformer_config(**config_kwargs)
+    assert config.batch_size == 100
+    assert config.insert_batch_size == 10000
+
+    config = load_transformer_config(**config_kwargs, insert_batch_size=2000)
+    assert config.batch_size == 100
+    assert config.insert_batch_size == 2000
@@ -0,0 +1,81 @@
+# Copyright 2025 Entalpic
+import gzip
+import threading
+
+import pytest
+
+from lematerial_fetcher.utils import io as io_utils
+from lematerial_fetcher.utils.io import (
+    decompress_file,
+    download_file_in_ranges,
+    strip_compression_suffix,
+)
+
+
+def test_strip_compression_suffix():
+    """Test only a trailing compression suffix is removed."""
+    assert strip_compression_suffix("/data/oqmd.sql.gz", "gz") == "/data/oqmd.sql"
+    assert strip_compression_suffix("/data.gz/oqmd.sql", "gz") == "/data.gz/oqmd.sql"
+    assert strip_compression_suffix("/data/file.json", None) == "/data/file.json"
+
+
+def test_decompress_file(tmp_path):
+    """Test a gzip file is decompressed next to the original, which is removed."""
+    compressed_path = tmp_path / "data.json.gz"
+    with gzip.open(compressed_path, "wb") as f:
+        f.write(b'{"key": "value"}')
+
+    output_path = decompress_file(str(compressed_path), "gz")
+
+    assert output_path == str(tmp_path / "data.json")
+    with open(output_path, "rb") as f:
+        assert f.read() == b'{"key": "value"}'
+    assert not compressed_path.exists()
+    assert not (tmp_path / "data.json.tmp").exists()
+
+
+def test_decompress_file_skips_existing_output(tmp_path):
+    """Test an already decompressed file is kept as is."""
+    compressed_path = tmp_path / "data.json.gz"
+    with gzip.open(compressed_path, "wb") as f:
+        f.write(b"new")
+    (tmp_path / "data.json").write_bytes(b"existing")
+
+    output_path = decompress_file(str(compressed_path), "gz")
+
+    with open(output_path, "rb") as f:
+        assert f.read() == b"existing"
+
+
+def test_decompress_file_unsupported_type(tmp_path):
+    """Test an unsupported compression type is rejected."""
+    with pytest.raises(ValueError):
+        decompress_file(str(tmp_path / "data.json.xz"), "xz")
+
+
+def test_download_file_in_ranges_stops_on_failure(tmp_path, monkeypatch):
+    """Test a failed range stops the other ones and removes the partial file."""
+    started = threading.Event()
+    stopped = []
+
+    def download_range(url, fd, start, end, pbar, pbar_lock, stop):
+        if start == 0:
+            # Fail once the other range is running, so that it is stopped
+            # rather than cancelled before it starts
+            started.wait(timeout=5)
+            raise IOError("Connection lost")
+        started.set()
+        stopped.append(stop.wait(timeout=5))
+
+    monkeypatch.setattr(io_utils, "_download_range", download_range)
+
+    with pytest.raises(IOError):
+        download_file_in_ranges(
+            "https://example.com/data.sql.gz",
+            str(tmp_path / "data.sql.gz"),
+            total_size=8,
+            num_connections=2,
+        )
+
+    assert stopped == [True]
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,65 @@
+# Copyright 2025 Entalpic
+import numpy as np
+import pytest
+from pymatgen.core import Composition, Lattice, Structure
+
+from lematerial_fetcher.utils.structure import (
+    get_composition_reduced_from_reduced_dict,
+    get_element_ratios_from_composition_reduced,
+    get_optimade_composition_fields,
+    get_optimade_composition_fields_from_sites,
+    get_optimade_from_pymatgen,
+    get_optimade_from_sites,
+)
+
+
+def test_element_ratios_are_alphabetically_ordered():
+    """Test that element ratios follow the alphabetical order of the elements."""
+    ratios = get_element_ratios_from_composition_reduced({"O": 3.0, "Al": 2.0})
+    assert ratios == pytest.approx([0.4, 0.6])
+
+
+def test_composition_reduced_from_reduced_dict():
+    """Test the reduced formula is built in alphabetical order without unit counts."""
+    formula = get_composition_reduced_from_reduced_dict({"O": 3.0, "Al": 2.0, "K": 1})
+    assert formula == "Al2KO3"
+
+
+def test_composition_fields_match_structure_fields():
+    """Test the composition-only fields match those computed from a Structure."""
+    structure = Structure(
+        Lattice.cubic(4.0),
+        ["O", "Al", "O"],
+        [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5], [0.5, 0.0, 0.0]],
+    )
+    from_structure = get_optimade_from_pymatgen(structure)
+    from_composition = get_optimade_composition_fields(Composition({"O": 2, "Al": 1}))
+
+    for key, value in from_composition.items():
+        assert from_structure[key] == value
+
+
+def test_optimade_from_sites_matches_pymatgen():
+    """Test the fields computed from the sites match those from a Structure."""
+    lattice = [[4.0, 0.0, 0.0], [0.0, 5.0, 0.0], [1.0, 0.0, 6.0]]
+    species = ["O", "Al", "O"]
+    frac_coords = [[0.0, 0.0, 0.0], [0.5, 0.5, 0.5], [0.5, 0.0, 0.25]]
+    from_structure = get_optimade_from_pymatgen(
+        Structure(lattice, species, frac_coords)
+    )
+    from_sites = get_optimade_from_sites(species, frac_coords, lattice)
+
+    assert from_sites.keys() == from_structure.keys()
+    for key, value in from_structure.items():
+        if key == "cartesian_site_positions":
+            np.testing.assert_allclose(from_sites[key], value)
+        else:
+            assert from_sites[key] == value
+
+
+def test_composition_fields_from_sites_ignore_site_order():
+    """Test the cached composition fields do not depend on the order of the sites."""
+    expected = get_optimade_composition_fields(Composition({"O": 2, "Al": 1}))
+
+    assert get_optimade_composition_fields_from_sites(["O", "Al", "O"]) == expected
+    assert get_optimade_composition_fields_from_sites(["Al", "O", "O"]) == expected